@@ -8,10 +8,32 @@ Usage:
     register_approval_endpoints(app, token_manager, approval_queue)
 """
 
+import hashlib
+import time
+from datetime import datetime
 from fastapi import FastAPI, Header, HTTPException, Depends
-from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Dict, Optional, Tuple
 from security import TokenManager, ApprovalQueue, TokenInfo
 
+# orjson is optional; fall back to stdlib json responses
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Routes are registered on the caller's app, so the response class is set
+# per route rather than as the app default
+RESPONSE_CLASS = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+# Validated admin tokens are cached briefly so repeated admin calls skip the
+# threadpool hop into validate_token. enabled/expires are still re-checked on
+# every hit, since they are plain fields on the cached TokenInfo.
+ADMIN_TOKEN_CACHE_TTL = 30.0
+ADMIN_TOKEN_CACHE_SIZE = 1024
+
 
 def register_approval_endpoints(
     app: FastAPI,
@@ -20,20 +42,48 @@ def register_approval_endpoints(
 ) -> None:
     """Register approval management endpoints"""
 
-    def require_admin_token(authorization: str = Header(...)) -> TokenInfo:
-        """FastAPI dependency for admin token authentication"""
-        if not authorization or not authorization.startswith("Bearer "):
+    # sha256(token) -> (TokenInfo, expires_at); raw tokens are never stored
+    admin_cache: Dict[bytes, Tuple[TokenInfo, float]] = {}
+
+    async def require_admin_token(authorization: str = Header(...)) -> TokenInfo:
+        """
+        FastAPI dependency for admin token authentication
+
+        Cache hits stay on the event loop; validate_token may save tokens.json
+        (its debounced last_used write), so misses are pushed to the threadpool.
+        """
+        if len(authorization) < 7 or authorization[:7] != "Bearer ":
             raise HTTPException(status_code=401, detail="Missing/invalid Authorization header")
 
-        token = authorization.split(" ", 1)[1]
-        token_info = token_manager.validate_token(token)
+        token = authorization[7:]
+        token_hash = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.monotonic()
+
+        cached = admin_cache.get(token_hash)
+        if cached and cached[1] > now:
+            info = cached[0]
+            # The token may have been disabled, expired or rotated since it was
+            # cached; if so, let validate_token raise the matching error
+            if (
+                info.enabled
+                and not (info.expires and datetime.now() > info.expires)
+                and token_manager.token_lookup.get(token) == info.token_id
+            ):
+                return info
+            del admin_cache[token_hash]
+
+        token_info = await run_in_threadpool(token_manager.validate_token, token)
 
         if "admin" not in token_info.scopes:
             raise HTTPException(status_code=403, detail="Admin scope required")
 
+        if len(admin_cache) >= ADMIN_TOKEN_CACHE_SIZE:
+            admin_cache.clear()
+        admin_cache[token_hash] = (token_info, now + ADMIN_TOKEN_CACHE_TTL)
+
         return token_info
 
-    @app.get("/approval/pending")
+    @app.get("/approval/pending", response_class=RESPONSE_CLASS)
     def list_pending_approvals(token_info: TokenInfo = Depends(require_admin_token)):
         """
         List all pending approval requests
@@ -44,7 +94,7 @@ def register_approval_endpoints(
             "pending": approval_queue.list_pending()
         }
     
-    @app.post("/approval/{request_id}/approve")
+    @app.post("/approval/{request_id}/approve", response_class=RESPONSE_CLASS)
     def approve_operation(request_id: str, token_info: TokenInfo = Depends(require_admin_token)):
         """
         Approve a pending operation
@@ -56,7 +106,7 @@ def register_approval_endpoints(
         else:
             raise HTTPException(status_code=404, detail="Request ID not found")
     
-    @app.post("/approval/{request_id}/deny")
+    @app.post("/approval/{request_id}/deny", response_class=RESPONSE_CLASS)
     def deny_operation(request_id: str, token_info: TokenInfo = Depends(require_admin_token)):
         """
         Deny a pending operation
@@ -68,37 +118,25 @@ def register_approval_endpoints(
         else:
             raise HTTPException(status_code=404, detail="Request ID not found")
     
-    @app.get("/tokens/list")
+    @app.get("/tokens/list", response_class=RESPONSE_CLASS)
     def list_tokens(token_info: TokenInfo = Depends(require_admin_token)):
         """
         List all configured tokens (without revealing token values)
 
         Requires: admin scope
         """
-        tokens = []
-        for tid, tinfo in token_manager.tokens.items():
-            tokens.append({
-                "token_id": tinfo.token_id,
-                "name": tinfo.name,
-                "scopes": list(tinfo.scopes),
-                "enabled": tinfo.enabled,
-                "created": tinfo.created.isoformat(),
-                "expires": tinfo.expires.isoformat() if tinfo.expires else None,
-                "last_used": tinfo.last_used.isoformat() if tinfo.last_used else None,
-                "metadata": tinfo.metadata
-            })
-
-        return {"tokens": tokens}
+        return {"tokens": token_manager.list_tokens()}
     
-    @app.post("/tokens/{token_id}/rotate")
-    def rotate_token(token_id: str, token_info: TokenInfo = Depends(require_admin_token)):
+    @app.post("/tokens/{token_id}/rotate", response_class=RESPONSE_CLASS)
+    async def rotate_token(token_id: str, token_info: TokenInfo = Depends(require_admin_token)):
         """
         Rotate a token (generate new value)
 
         Requires: admin scope
         """
         try:
-            new_token = token_manager.rotate_token(token_id)
+            new_token = await run_in_threadpool(token_manager.rotate_token, token_id)
+            admin_cache.clear()
             return {
                 "token_id": token_id,
                 "new_token": new_token,
@@ -107,15 +145,16 @@ def register_approval_endpoints(
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
     
-    @app.post("/tokens/{token_id}/disable")
-    def disable_token(token_id: str, token_info: TokenInfo = Depends(require_admin_token)):
+    @app.post("/tokens/{token_id}/disable", response_class=RESPONSE_CLASS)
+    async def disable_token(token_id: str, token_info: TokenInfo = Depends(require_admin_token)):
         """
         Disable a token
 
         Requires: admin scope
         """
         try:
-            token_manager.disable_token(token_id)
+            await run_in_threadpool(token_manager.disable_token, token_id)
+            admin_cache.clear()
             return {
                 "token_id": token_id,
                 "status": "disabled"
@@ -8,54 +8,105 @@ Usage:
     python3 chatgpt_proxy.py
 
 Then tell ChatGPT to access:
-    http://localhost:5000/chat
-    http://localhost:5000/ls
-    http://localhost:5000/read
-    http://localhost:5000/write
-    http://localhost:5000/exec
+    http://localhost:5001/chat
+    http://localhost:5001/ls
+    http://localhost:5001/read
+    http://localhost:5001/write
+    http://localhost:5001/exec
 
 Or upload chatgpt_proxy_client.py to ChatGPT for easy access.
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from fastapi import FastAPI, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, Field
 import os
-import requests
+import re
 import sys
 from pathlib import Path
+from typing import List
 
 # Add Trapdoor directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 import trapdoor_connector as td
 
-app = Flask(__name__)
+# orjson is optional; fall back to stdlib json responses
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+app = FastAPI(
+    title="ChatGPT Proxy for Trapdoor",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # CORS configuration - default to localhost only for security
 ALLOWED_ORIGINS = os.environ.get(
     "TRAPDOOR_PROXY_CORS_ORIGINS",
     "http://localhost:*,http://127.0.0.1:*"
 ).split(",")
-CORS(app, origins=ALLOWED_ORIGINS, supports_credentials=True)
+app.add_middleware(
+    CORSMiddleware,
+    # Origins may use '*' as a wildcard (e.g. any localhost port)
+    allow_origin_regex="|".join(
+        re.escape(origin.strip()).replace(r"\*", ".*") for origin in ALLOWED_ORIGINS
+    ),
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    # Let browsers cache preflight results for a day
+    max_age=86400,
+)
+
+
+def _error(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+# Request models - missing/empty required fields are rejected with a 422
+# before the handler runs
+
+class ChatRequest(BaseModel):
+    prompt: str = Field(..., min_length=1)
+
+class PathRequest(BaseModel):
+    path: str = Field(..., min_length=1)
 
-@app.route('/health', methods=['GET'])
-def health():
+class WriteRequest(BaseModel):
+    path: str = Field(..., min_length=1)
+    content: str = ""
+
+class ExecRequest(BaseModel):
+    cmd: List[str] = Field(..., min_length=1)
+    cwd: str = "/tmp"
+
+
+# td.* helpers are blocking `requests` calls, so each handler runs them in
+# the threadpool and the event loop stays free for other requests.
+
+@app.get('/health')
+async def health():
     """Check if proxy and Trapdoor are reachable"""
     try:
-        trapdoor_health = td.health()
-        return jsonify({
+        trapdoor_health = await run_in_threadpool(td.health)
+        return {
             "proxy": "ok",
             "trapdoor": trapdoor_health
-        })
+        }
     except Exception as e:
-        return jsonify({
+        return JSONResponse({
             "proxy": "ok",
             "trapdoor": "error",
             "error": str(e)
-        }), 503
+        }, status_code=503)
 
 
-@app.route('/chat', methods=['POST'])
-def chat():
+@app.post('/chat')
+async def chat(req: ChatRequest):
     """
     Chat with local model
 
@@ -63,21 +114,15 @@ def chat():
     Returns: {"response": "model response"}
     """
     try:
-        data = request.get_json()
-        prompt = data.get('prompt', '')
-
-        if not prompt:
-            return jsonify({"error": "Missing 'prompt' field"}), 400
-
-        response = td.chat(prompt)
-        return jsonify({"response": response})
+        response = await run_in_threadpool(td.chat, req.prompt)
+        return {"response": response}
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error(str(e), 500)
 
 
-@app.route('/ls', methods=['GET'])
-def list_files():
+@app.get('/ls')
+async def list_files(path: str = '/'):
     """
     List directory contents
 
@@ -85,42 +130,42 @@ def list_files():
     Returns: {"files": [...]}
     """
     try:
-        path = request.args.get('path', '/')
-        files = td.ls(path)
-        return jsonify({"files": files, "path": path})
+        files = await run_in_threadpool(td.ls, path)
+        return {"files": files, "path": path}
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error(str(e), 500)
 
 
-@app.route('/read', methods=['GET', 'POST'])
-def read_file():
+@app.get('/read')
+async def read_file(path: str = Query(..., min_length=1)):
     """
     Read file contents
 
     Query: ?path=/path/to/file
-    OR Body: {"path": "/path/to/file"}
     Returns: {"content": "file contents", "path": "..."}
     """
     try:
-        if request.method == 'POST':
-            data = request.get_json()
-            path = data.get('path', '')
-        else:
-            path = request.args.get('path', '')
+        content = await run_in_threadpool(td.read_file, path)
+        return {"content": content, "path": path}
+
+    except Exception as e:
+        return _error(str(e), 500)
 
-        if not path:
-            return jsonify({"error": "Missing 'path' parameter"}), 400
 
-        content = td.read_file(path)
-        return jsonify({"content": content, "path": path})
+@app.post('/read')
+async def read_file_post(req: PathRequest):
+    """
+    Read file contents
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    Body: {"path": "/path/to/file"}
+    Returns: {"content": "file contents", "path": "..."}
+    """
+    return await read_file(req.path)
 
 
-@app.route('/write', methods=['POST'])
-def write_file():
+@app.post('/write')
+async def write_file(req: WriteRequest):
     """
     Write file contents
 
@@ -128,22 +173,15 @@ def write_file():
     Returns: {"status": "ok", "path": "..."}
     """
     try:
-        data = request.get_json()
-        path = data.get('path', '')
-        content = data.get('content', '')
-
-        if not path:
-            return jsonify({"error": "Missing 'path' field"}), 400
-
-        result = td.write_file(path, content)
-        return jsonify({"status": "ok", "path": path, "result": result})
+        result = await run_in_threadpool(td.write_file, req.path, req.content)
+        return {"status": "ok", "path": req.path, "result": result}
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error(str(e), 500)
 
 
-@app.route('/exec', methods=['POST'])
-def execute():
+@app.post('/exec')
+async def execute(req: ExecRequest):
     """
     Execute command
 
@@ -151,22 +189,14 @@ def execute():
     Returns: {"stdout": "...", "stderr": "...", "returncode": 0}
     """
     try:
-        data = request.get_json()
-        cmd = data.get('cmd', [])
-        cwd = data.get('cwd', '/tmp')
-
-        if not cmd:
-            return jsonify({"error": "Missing 'cmd' field"}), 400
-
-        result = td.exec_command(cmd, cwd=cwd)
-        return jsonify(result)
+        return await run_in_threadpool(td.exec_command, req.cmd, cwd=req.cwd)
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error(str(e), 500)
 
 
-@app.route('/mkdir', methods=['POST'])
-def make_dir():
+@app.post('/mkdir')
+async def make_dir(req: PathRequest):
     """
     Create directory
 
@@ -174,21 +204,15 @@ def make_dir():
     Returns: {"status": "ok", "path": "..."}
     """
     try:
-        data = request.get_json()
-        path = data.get('path', '')
-
-        if not path:
-            return jsonify({"error": "Missing 'path' field"}), 400
-
-        result = td.mkdir(path)
-        return jsonify({"status": "ok", "path": path, "result": result})
+        result = await run_in_threadpool(td.mkdir, req.path)
+        return {"status": "ok", "path": req.path, "result": result}
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error(str(e), 500)
 
 
-@app.route('/rm', methods=['POST'])
-def remove():
+@app.post('/rm')
+async def remove(req: PathRequest):
     """
     Remove file or directory
 
@@ -196,17 +220,11 @@ def remove():
     Returns: {"status": "ok", "path": "..."}
     """
     try:
-        data = request.get_json()
-        path = data.get('path', '')
-
-        if not path:
-            return jsonify({"error": "Missing 'path' field"}), 400
-
-        result = td.rm(path)
-        return jsonify({"status": "ok", "path": path, "result": result})
+        result = await run_in_threadpool(td.rm, req.path)
+        return {"status": "ok", "path": req.path, "result": result}
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _error(str(e), 500)
 
 
 if __name__ == '__main__':
@@ -229,7 +247,8 @@ if __name__ == '__main__':
         print("=" * 60)
         print()
 
-        app.run(host='0.0.0.0', port=5001, debug=True)
+        import uvicorn
+        uvicorn.run(app, host='0.0.0.0', port=5001)
     else:
         print()
         print("❌ Cannot connect to Trapdoor")
@@ -32,22 +32,26 @@ Usage:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any
 
 # Configuration
 PROXY_URL = "http://localhost:5001"
 
+# Shared session so calls reuse keep-alive connections to the proxy
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+
 def _request(endpoint: str, method: str = "GET", **kwargs):
     """Internal request helper"""
     url = f"{PROXY_URL}{endpoint}"
 
-    if method == "GET":
-        resp = requests.get(url, **kwargs)
-    elif method == "POST":
-        resp = requests.post(url, **kwargs)
-    else:
+    if method not in ("GET", "POST"):
         raise ValueError(f"Unsupported method: {method}")
 
+    resp = _session.request(method, url, **kwargs)
     resp.raise_for_status()
     return resp.json()
 
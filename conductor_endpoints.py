@@ -14,31 +14,121 @@ import asyncio
 import subprocess
 import json
 import os
+import tempfile
+import types
 from typing import Optional, List
 from datetime import datetime
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Query, Header
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+# orjson is optional; fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(data):
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _sse(payload: dict) -> str:
+    """Format one server-sent event; JSON keeps newlines out of the frame"""
+    body = orjson.dumps(payload).decode() if ORJSON_AVAILABLE else json.dumps(payload)
+    return f"data: {body}\n\n"
+
 
 # ==============================================================================
 # Configuration
 # ==============================================================================
 
+# Mesh machines (Tailscale IPs)
+MACHINES = types.MappingProxyType({
+    "black": {"ip": "100.70.207.76", "role": "orchestrator"},
+    "silver-fox": {"ip": "100.121.212.93", "role": "storage"},
+    "nvidia-spark": {"ip": "100.73.240.125", "role": "gpu"},
+    "neon": {"ip": "100.80.193.92", "role": "docker"},
+})
+MACHINE_IPS = types.MappingProxyType({name: info["ip"] for name, info in MACHINES.items()})
+
 # Track spawned sessions
 SESSIONS_FILE = Path.home() / ".trapdoor" / "conductor_sessions.json"
 
+# Seconds to coalesce session changes before flushing them to disk
+SESSIONS_FLUSH_DELAY = 1.0
+
+# Parsed sessions file, reused while the file's (mtime, size) is unchanged
+_sessions_cache = {"stat": None, "data": None}
+
+
+def _sessions_stat():
+    st = SESSIONS_FILE.stat()
+    return (st.st_mtime_ns, st.st_size)
+
 
 def load_sessions() -> dict:
-    if SESSIONS_FILE.exists():
-        return json.loads(SESSIONS_FILE.read_text())
-    return {"sessions": []}
+    try:
+        stat = _sessions_stat()
+    except FileNotFoundError:
+        return {"sessions": []}
+
+    if _sessions_cache["stat"] == stat:
+        return _sessions_cache["data"]
+
+    if ORJSON_AVAILABLE:
+        data = orjson.loads(SESSIONS_FILE.read_bytes())
+    else:
+        data = json.loads(SESSIONS_FILE.read_text())
+
+    _sessions_cache["stat"] = stat
+    _sessions_cache["data"] = data
+    return data
 
 
 def save_sessions(data: dict):
     SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SESSIONS_FILE.write_text(json.dumps(data, indent=2))
+    if ORJSON_AVAILABLE:
+        SESSIONS_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        SESSIONS_FILE.write_text(json.dumps(data, indent=2))
+
+    _sessions_cache["stat"] = _sessions_stat()
+    _sessions_cache["data"] = data
+
+
+def _live_pids() -> Optional[set]:
+    """
+    Snapshot of live PIDs in one call (/proc on Linux, psutil elsewhere).
+
+    Returns None when neither is available; callers then probe per PID.
+    """
+    try:
+        return {int(p) for p in os.listdir("/proc") if p.isdigit()}
+    except OSError:
+        pass
+    try:
+        import psutil
+        return set(psutil.pids())
+    except ImportError:
+        return None
+
+
+def _pid_alive(pid: str, live_pids: Optional[set]) -> bool:
+    try:
+        pid = int(pid)
+    except ValueError:
+        return False
+    if live_pids is not None:
+        return pid in live_pids
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
 
 
 # ==============================================================================
@@ -46,7 +136,74 @@ def save_sessions(data: dict):
 # ==============================================================================
 
 def create_conductor_router():
-    router = APIRouter()
+    router = APIRouter(
+        default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+    )
+
+    # One pooled client per router; per-call timeouts are passed per request
+    http = {"client": None}
+
+    def get_http_client():
+        import httpx
+
+        if http["client"] is None:
+            http["client"] = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_keepalive_connections=32)
+            )
+        return http["client"]
+
+    # In-memory session registry is the source of truth; the file is a
+    # debounced backup written by a background task after mutations
+    registry = {"data": None, "dirty": None, "flusher": None}
+
+    # Serializes registry read-modify-write and file flushes, so concurrent
+    # spawns/polls never lose an update and two flushes never overlap
+    sessions_lock = asyncio.Lock()
+
+    def get_sessions() -> dict:
+        if registry["data"] is None:
+            registry["data"] = load_sessions()
+        return registry["data"]
+
+    def snapshot_sessions() -> dict:
+        data = get_sessions()
+        return {**data, "sessions": [dict(s) for s in data.get("sessions", [])]}
+
+    async def flush_sessions():
+        while True:
+            await registry["dirty"].wait()
+            await asyncio.sleep(SESSIONS_FLUSH_DELAY)
+            async with sessions_lock:
+                registry["dirty"].clear()
+                try:
+                    await asyncio.to_thread(save_sessions, snapshot_sessions())
+                except Exception as e:
+                    print(f"Failed to save conductor sessions: {e}")
+
+    def mark_sessions_dirty():
+        if registry["dirty"] is None:
+            registry["dirty"] = asyncio.Event()
+        if registry["flusher"] is None or registry["flusher"].done():
+            registry["flusher"] = asyncio.create_task(flush_sessions())
+        registry["dirty"].set()
+
+    @router.on_event("shutdown")
+    async def close_http_client():
+        if http["client"] is not None:
+            await http["client"].aclose()
+            http["client"] = None
+
+    @router.on_event("shutdown")
+    async def final_flush_sessions():
+        # Holding the lock waits out any flush already writing the file
+        async with sessions_lock:
+            if registry["flusher"] is not None:
+                registry["flusher"].cancel()
+                registry["flusher"] = None
+            if registry["dirty"] is not None and registry["dirty"].is_set():
+                registry["dirty"].clear()
+                save_sessions(snapshot_sessions())
 
     @router.get("/spawn")
     async def spawn_claude(
@@ -63,35 +220,45 @@ def create_conductor_router():
 
         This allows cloud Claude (via WebFetch) to spawn local Claude instances.
         """
-        # Build command
-        cmd = f"cd {working_dir} && claude --print --dangerously-skip-permissions"
+        # Direct argv: no shell, so the prompt is never parsed or re-quoted
+        cmd = ["claude", "--print", "--dangerously-skip-permissions", "--prompt", prompt]
 
         if background:
             # Spawn in background, capture PID
-            full_cmd = f'nohup bash -c \'{cmd} --prompt "{prompt}"\' > /tmp/claude_spawn_$$.log 2>&1 & echo $!'
-
+            log = None
             try:
-                result = subprocess.run(
-                    ["bash", "-c", full_cmd],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-
-                pid = result.stdout.strip()
+                with tempfile.NamedTemporaryFile(
+                    prefix="claude_spawn_", suffix=".log", dir="/tmp", delete=False
+                ) as log:
+                    proc = subprocess.Popen(
+                        cmd,
+                        cwd=working_dir,
+                        stdin=subprocess.DEVNULL,
+                        stdout=log,
+                        stderr=subprocess.STDOUT,
+                        start_new_session=True
+                    )
+
+                pid = str(proc.pid)
+
+                # The log is named after the PID, which is only known after spawning
+                log_file = f"/tmp/claude_spawn_{pid}.log"
+                os.replace(log.name, log_file)
 
                 # Record session
-                sessions = load_sessions()
-                session_id = f"spawn_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{pid}"
-                sessions["sessions"].append({
-                    "id": session_id,
-                    "pid": pid,
-                    "prompt": prompt[:200],
-                    "working_dir": working_dir,
-                    "started_at": datetime.now().isoformat(),
-                    "status": "running"
-                })
-                save_sessions(sessions)
+                started_at = datetime.now()
+                async with sessions_lock:
+                    sessions = get_sessions()
+                    session_id = f"spawn_{started_at.strftime('%Y%m%d_%H%M%S')}_{pid}"
+                    sessions["sessions"].append({
+                        "id": session_id,
+                        "pid": pid,
+                        "prompt": prompt[:200],
+                        "working_dir": working_dir,
+                        "started_at": started_at.isoformat(),
+                        "status": "running"
+                    })
+                    mark_sessions_dirty()
 
                 return {
                     "status": "spawned",
@@ -99,62 +266,73 @@ def create_conductor_router():
                     "pid": pid,
                     "prompt": prompt[:100] + "..." if len(prompt) > 100 else prompt,
                     "working_dir": working_dir,
-                    "log_file": f"/tmp/claude_spawn_{pid}.log"
+                    "log_file": log_file
                 }
 
-            except subprocess.TimeoutExpired:
-                raise HTTPException(500, "Spawn command timed out")
             except Exception as e:
+                if log is not None and os.path.exists(log.name):
+                    os.unlink(log.name)
                 raise HTTPException(500, f"Spawn failed: {str(e)}")
 
         else:
-            # Run synchronously (will block)
-            full_cmd = f'{cmd} --prompt "{prompt}"'
-
+            # Run to completion without blocking the event loop
             try:
-                result = subprocess.run(
-                    ["bash", "-c", full_cmd],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    cwd=working_dir
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=working_dir,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
                 )
 
+                try:
+                    stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    return {"status": "timeout", "timeout": timeout}
+
+                stdout = stdout.decode("utf-8", errors="replace")
+                stderr = stderr.decode("utf-8", errors="replace")
+
                 return {
                     "status": "completed",
-                    "returncode": result.returncode,
-                    "stdout": result.stdout[-5000:] if len(result.stdout) > 5000 else result.stdout,
-                    "stderr": result.stderr[-1000:] if len(result.stderr) > 1000 else result.stderr
+                    "returncode": proc.returncode,
+                    "stdout": stdout[-5000:] if len(stdout) > 5000 else stdout,
+                    "stderr": stderr[-1000:] if len(stderr) > 1000 else stderr
                 }
 
-            except subprocess.TimeoutExpired:
-                return {"status": "timeout", "timeout": timeout}
             except Exception as e:
                 raise HTTPException(500, f"Execution failed: {str(e)}")
 
     @router.get("/sessions")
     async def list_sessions():
         """List all spawned Claude sessions."""
-        sessions = load_sessions()
-
-        # Update status of running sessions
-        for session in sessions.get("sessions", []):
-            if session.get("status") == "running":
-                pid = session.get("pid")
-                if pid:
-                    # Check if process is still running
-                    try:
-                        os.kill(int(pid), 0)
-                    except (OSError, ValueError):
-                        session["status"] = "completed"
-
-        save_sessions(sessions)
+        async with sessions_lock:
+            sessions = get_sessions()
+            dirty = False
+
+            # One PID scan per poll instead of a kill() probe per session
+            live_pids = _live_pids()
+
+            # Update status of running sessions
+            for session in sessions.get("sessions", []):
+                if session.get("status") == "running":
+                    pid = session.get("pid")
+                    if pid:
+                        # Check if process is still running
+                        if not _pid_alive(pid, live_pids):
+                            session["status"] = "completed"
+                            dirty = True
+
+            # Only schedule a flush when a session actually finished
+            if dirty:
+                mark_sessions_dirty()
         return sessions
 
     @router.get("/session/{session_id}")
     async def get_session(session_id: str):
         """Get details of a specific session."""
-        sessions = load_sessions()
+        sessions = get_sessions()
 
         for session in sessions.get("sessions", []):
             if session.get("id") == session_id:
@@ -165,8 +343,11 @@ def create_conductor_router():
                     log_file = Path(f"/tmp/claude_spawn_{pid}.log")
                     if log_file.exists():
                         try:
-                            content = log_file.read_text()
-                            log_content = content[-10000:] if len(content) > 10000 else content
+                            # Read only the tail; logs can grow without bound
+                            with log_file.open("rb") as f:
+                                size = f.seek(0, os.SEEK_END)
+                                f.seek(max(0, size - 10000))
+                                log_content = f.read().decode("utf-8", errors="replace")
                         except:
                             pass
 
@@ -181,45 +362,81 @@ def create_conductor_router():
     async def query_qwen(
         prompt: str = Query(..., description="Prompt for Qwen"),
         system: str = Query("You are a helpful coding assistant.", description="System prompt"),
-        max_tokens: int = Query(2000, description="Max tokens")
+        max_tokens: int = Query(2000, description="Max tokens"),
+        stream: bool = Query(False, description="Stream tokens as server-sent events"),
+        accept: Optional[str] = Header(None)
     ):
         """
         Query local Qwen model directly.
 
         GET /conductor/qwen?prompt=How+do+I+fix+this+error
+
+        With ?stream=true (or Accept: text/event-stream) tokens are relayed
+        as SSE events while Qwen generates them, instead of one JSON reply.
         """
-        import httpx
+        payload = {
+            "model": "qwen2.5-coder:32b",
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            "stream": False,
+            "options": {"num_predict": max_tokens}
+        }
 
-        try:
-            async with httpx.AsyncClient(timeout=120) as client:
-                response = await client.post(
-                    "http://localhost:11434/api/chat",
-                    json={
-                        "model": "qwen2.5-coder:32b",
-                        "messages": [
-                            {"role": "system", "content": system},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "stream": False,
-                        "options": {"num_predict": max_tokens}
-                    }
-                )
+        if stream or (accept and "text/event-stream" in accept):
+            payload["stream"] = True
+
+            async def events():
+                try:
+                    async with get_http_client().stream(
+                        "POST", "http://localhost:11434/api/chat", json=payload, timeout=120
+                    ) as response:
+                        if response.status_code != 200:
+                            detail = (await response.aread()).decode("utf-8", errors="replace")
+                            yield _sse({"status": "error", "code": response.status_code, "detail": detail[:500]})
+                            return
+
+                        async for line in response.aiter_lines():
+                            if not line:
+                                continue
+                            chunk = _json_loads(line)
+                            if chunk.get("done"):
+                                yield _sse({
+                                    "status": "success",
+                                    "done": True,
+                                    "eval_count": chunk.get("eval_count"),
+                                    "total_duration": chunk.get("total_duration")
+                                })
+                            else:
+                                yield _sse({"content": chunk.get("message", {}).get("content", "")})
+                except Exception as e:
+                    yield _sse({"status": "error", "detail": f"Qwen query failed: {str(e)}"})
+
+            return StreamingResponse(events(), media_type="text/event-stream")
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "status": "success",
-                        "model": "qwen2.5-coder:32b",
-                        "response": data.get("message", {}).get("content", ""),
-                        "eval_count": data.get("eval_count"),
-                        "total_duration": data.get("total_duration")
-                    }
-                else:
-                    return {
-                        "status": "error",
-                        "code": response.status_code,
-                        "detail": response.text[:500]
-                    }
+        try:
+            response = await get_http_client().post(
+                "http://localhost:11434/api/chat",
+                timeout=120,
+                json=payload
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "status": "success",
+                    "model": "qwen2.5-coder:32b",
+                    "response": data.get("message", {}).get("content", ""),
+                    "eval_count": data.get("eval_count"),
+                    "total_duration": data.get("total_duration")
+                }
+            else:
+                return {
+                    "status": "error",
+                    "code": response.status_code,
+                    "detail": response.text[:500]
+                }
 
         except Exception as e:
             raise HTTPException(500, f"Qwen query failed: {str(e)}")
@@ -227,29 +444,23 @@ def create_conductor_router():
     @router.get("/machines")
     async def list_machines():
         """List mesh machines and their status."""
-        machines = {
-            "black": {"ip": "100.70.207.76", "role": "orchestrator"},
-            "silver-fox": {"ip": "100.121.212.93", "role": "storage"},
-            "nvidia-spark": {"ip": "100.73.240.125", "role": "gpu"},
-            "neon": {"ip": "100.80.193.92", "role": "docker"},
-        }
+        client = get_http_client()
 
-        results = {}
-        import httpx
-
-        async with httpx.AsyncClient(timeout=5) as client:
-            for name, info in machines.items():
-                try:
-                    resp = await client.get(f"http://{info['ip']}:8080/health")
-                    results[name] = {
-                        **info,
-                        "status": "online" if resp.status_code == 200 else "error",
-                        "health": resp.json() if resp.status_code == 200 else None
-                    }
-                except:
-                    results[name] = {**info, "status": "offline"}
+        async def probe(name, info):
+            try:
+                resp = await client.get(f"http://{info['ip']}:8080/health", timeout=5)
+                return name, {
+                    **info,
+                    "status": "online" if resp.status_code == 200 else "error",
+                    "health": resp.json() if resp.status_code == 200 else None
+                }
+            except:
+                return name, {**info, "status": "offline"}
 
-        return results
+        # Probe all machines concurrently: latency is the slowest probe, not the sum
+        return dict(await asyncio.gather(
+            *(probe(name, info) for name, info in MACHINES.items())
+        ))
 
     @router.get("/delegate")
     async def delegate_to_machine(
@@ -262,31 +473,21 @@ def create_conductor_router():
 
         GET /conductor/delegate?machine=nvidia-spark&endpoint=/health
         """
-        machines = {
-            "black": "100.70.207.76",
-            "silver-fox": "100.121.212.93",
-            "nvidia-spark": "100.73.240.125",
-            "neon": "100.80.193.92",
-        }
-
-        if machine not in machines:
+        if machine not in MACHINE_IPS:
             raise HTTPException(400, f"Unknown machine: {machine}")
 
-        import httpx
-
-        url = f"http://{machines[machine]}:8080{endpoint}"
+        url = f"http://{MACHINE_IPS[machine]}:8080{endpoint}"
         if path:
             url += f"?path={path}"
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.get(url)
-                return {
-                    "machine": machine,
-                    "endpoint": endpoint,
-                    "status_code": resp.status_code,
-                    "response": resp.json() if resp.headers.get("content-type", "").startswith("application/json") else resp.text[:5000]
-                }
+            resp = await get_http_client().get(url, timeout=30)
+            return {
+                "machine": machine,
+                "endpoint": endpoint,
+                "status_code": resp.status_code,
+                "response": resp.json() if resp.headers.get("content-type", "").startswith("application/json") else resp.text[:5000]
+            }
         except Exception as e:
             raise HTTPException(500, f"Delegation failed: {str(e)}")
 
@@ -301,7 +502,8 @@ if __name__ == "__main__":
     from fastapi import FastAPI
     import uvicorn
 
-    app = FastAPI(title="Conductor API", description="Orchestrate Claude Code sessions")
+    app = FastAPI(title="Conductor API", description="Orchestrate Claude Code sessions",
+                  default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse)
     app.include_router(create_conductor_router(), prefix="/conductor")
 
     @app.get("/health")
@@ -6,17 +6,26 @@ and connection details without juggling individual scripts.
 """
 from __future__ import annotations
 
+import http.client
 import json
 import os
+import selectors
+import shutil
 import signal
+import socket
 import subprocess
 import sys
 import textwrap
 import time
-import urllib.error
-import urllib.request
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
+
+# orjson is optional; fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 try:
     from memory import store as memory_store
@@ -26,6 +35,21 @@ except Exception:  # pragma: no cover
 
 REPO_ROOT = Path(__file__).resolve().parent
 SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+# Scripts with an in-process Python port: main(args, env) -> (rc, stdout, stderr).
+# Anything not listed here still runs through bash.
+sys.path.insert(0, str(SCRIPTS_DIR))
+try:
+    import manage_auth_token
+except Exception:  # pragma: no cover
+    manage_auth_token = None
+
+_PY_IMPLS: Dict[str, Callable[..., tuple[int, str, str]]] = {}
+if manage_auth_token is not None:
+    _PY_IMPLS["manage_auth_token.sh"] = manage_auth_token.main
+# Resolved once; the scripts' own "#!/usr/bin/env bash" shebang would add an
+# env hop and a PATH search to every run
+BASH = shutil.which("bash") or "/bin/bash"
 CONFIG_PATH = REPO_ROOT / "config" / "trapdoor.json"
 RUNTIME_DIR = REPO_ROOT / ".proxy_runtime"
 SESSION_PATH = RUNTIME_DIR / "session.json"
@@ -33,6 +57,43 @@ PUBLIC_URL_PATH = RUNTIME_DIR / "public_url.txt"
 MEMORY_DIR = REPO_ROOT / "memory"
 LESSONS_PATH = MEMORY_DIR / "lessons.jsonl"
 
+# The status block is redrawn after every menu action; avoid redoing work
+HEALTH_CACHE_TTL = 2.0
+# A stopped proxy refuses or drops the connect quickly; only the response
+# gets the full timeout
+HEALTH_CONNECT_TIMEOUT = 0.2
+HEALTH_READ_TIMEOUT = 1.5
+# How long stopped services get to exit after SIGTERM before SIGKILL
+STOP_GRACE_PERIOD = 3.0
+# Reading the token hits the keychain (which may prompt); rotation clears it
+TOKEN_CACHE_TTL = 60.0
+# While the menu waits for input, re-check status this often and repaint on change
+STATUS_REFRESH_INTERVAL = 5.0
+MENU_PROMPT = "Select an option (1-11): "
+MENU_TEXT = textwrap.dedent(
+    """
+    Menu
+    -----------------------------------------
+    1.  Start proxy & tunnel
+    2.  Stop proxy & tunnel
+    3.  Show connection instructions
+    4.  Rotate tools token
+    5.  Run health check
+    6.  Run self-test
+    7.  Generate access pack
+    8.  Open logs folder
+    9.  Review learning log
+    10. Add learning note
+    11. Exit
+
+    """
+)
+_health_cache: Dict[int, tuple[float, bool, Optional[Dict[str, Any]]]] = {}
+_health_conns: Dict[int, "_HealthConnection"] = {}
+_file_cache: Dict[Path, tuple[tuple[int, int], Any]] = {}
+_token_cache: Optional[tuple[float, str]] = None
+_last_status: list[str] = []
+
 
 def format_timestamp(ts: float) -> str:
     try:
@@ -41,18 +102,35 @@ def format_timestamp(ts: float) -> str:
         return "(unknown)"
 
 
+def _cached_by_stat(path: Path, loader: Callable[[Path], Any]) -> Any:
+    """Return loader(path), re-running it only when the file's mtime or size changes."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = loader(path)
+    _file_cache[path] = (key, value)
+    return value
+
+
+def _load_json(path: Path) -> Any:
+    data = path.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
 def load_config() -> Dict[str, Any]:
+    """Parsed trapdoor.json, shared between calls until the file changes; don't mutate."""
     if not CONFIG_PATH.exists():
         print("⚠️  Could not find config/trapdoor.json. Have you pulled the latest repo?", file=sys.stderr)
         return {}
-    with CONFIG_PATH.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+    return _cached_by_stat(CONFIG_PATH, _load_json)
 
 
 def read_session() -> Dict[str, Any]:
     if SESSION_PATH.exists():
         try:
-            return json.loads(SESSION_PATH.read_text(encoding="utf-8"))
+            return _cached_by_stat(SESSION_PATH, _load_json)
         except Exception:
             pass
     return {}
@@ -65,34 +143,76 @@ def ensure_runtime_dir() -> None:
 def _read_public_url() -> str:
     if PUBLIC_URL_PATH.exists():
         try:
-            return PUBLIC_URL_PATH.read_text(encoding="utf-8").strip()
+            return _cached_by_stat(PUBLIC_URL_PATH, lambda p: p.read_text(encoding="utf-8").strip())
         except Exception:
             return ""
     return ""
 
 
+def _scan_lessons(path: Path) -> int:
+    """Count lines by scanning raw bytes for newlines (no per-line decoding)."""
+    count = 0
+    last = b"\n"
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            count += block.count(b"\n")
+            last = block[-1:]
+    # A final line without a trailing newline still counts
+    return count + (last != b"\n")
+
+
 def _count_lessons() -> Optional[int]:
     if not LESSONS_PATH.exists():
         return 0
     try:
-        with LESSONS_PATH.open("r", encoding="utf-8") as fh:
-            return sum(1 for _ in fh)
+        return _cached_by_stat(LESSONS_PATH, _scan_lessons)
     except Exception:
         return None
 
 
+class _HealthConnection(http.client.HTTPConnection):
+    """HTTPConnection with a short connect timeout and a longer read timeout."""
+
+    def connect(self) -> None:
+        self.sock = socket.create_connection((self.host, self.port), HEALTH_CONNECT_TIMEOUT)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.settimeout(self.timeout)
+
+
+def _health_request(port: int) -> tuple[int, bytes]:
+    """GET /health over a kept-alive connection, reconnecting once if it went stale."""
+    for attempt in range(2):
+        conn = _health_conns.get(port)
+        if conn is None:
+            conn = _health_conns[port] = _HealthConnection("127.0.0.1", port, timeout=HEALTH_READ_TIMEOUT)
+        try:
+            conn.request("GET", "/health")
+            resp = conn.getresponse()
+            return resp.status, resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            _health_conns.pop(port, None)
+            if attempt:
+                raise
+
+
 def _ping_health(port: int) -> tuple[bool, Optional[Dict[str, Any]]]:
+    cached = _health_cache.get(port)
+    if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+        return cached[1], cached[2]
     try:
-        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1.5) as resp:
-            if resp.status != 200:
-                return False, None
-            data = json.loads(resp.read().decode("utf-8"))
-            return True, data
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, json.JSONDecodeError):
-        return False, None
+        status, body = _health_request(port)
+        if status != 200:
+            result = (False, None)
+        else:
+            result = (True, json.loads(body.decode("utf-8")))
+    except (http.client.HTTPException, OSError, json.JSONDecodeError):
+        result = (False, None)
+    _health_cache[port] = (time.monotonic(), *result)
+    return result
 
 
-def display_status() -> None:
+def _status_lines() -> list[str]:
     cfg = load_config()
     session = read_session()
     port = cfg.get("app", {}).get("port", 8080)
@@ -102,36 +222,57 @@ def display_status() -> None:
     model = (health_payload or {}).get("model") or session.get("model") or cfg.get("app", {}).get("model")
     lessons_count = _count_lessons()
 
-    print("\n=========================================")
-    print("Trapdoor Status")
-    print("-----------------------------------------")
     proxy_state = "ONLINE" if healthy else "offline"
     icon = "🟢" if healthy else "🔴"
-    print(f"Proxy: {icon} {proxy_state}  (profile: {profile}, port {port})")
+    lines = [
+        "\n=========================================",
+        "Trapdoor Status",
+        "-----------------------------------------",
+        f"Proxy: {icon} {proxy_state}  (profile: {profile}, port {port})",
+    ]
     if model:
-        print(f"Model: {model}")
+        lines.append(f"Model: {model}")
     if healthy and health_payload:
         backend = health_payload.get("backend")
         if backend:
-            print(f"Backend: {backend}")
+            lines.append(f"Backend: {backend}")
     if public_url:
-        print(f"Public URL: {public_url}")
+        lines.append(f"Public URL: {public_url}")
     else:
-        print("Public URL: (not published)")
+        lines.append("Public URL: (not published)")
     if lessons_count is not None:
-        print(f"Lessons stored: {lessons_count}")
+        lines.append(f"Lessons stored: {lessons_count}")
     else:
-        print("Lessons stored: (unavailable)")
-    print("=========================================")
+        lines.append("Lessons stored: (unavailable)")
+    lines.append("=========================================")
+    return lines
+
+
+def display_status() -> None:
+    """Print the status block, or a one-line marker if it is unchanged since last shown."""
+    global _last_status
+    lines = _status_lines()
+    if lines == _last_status:
+        # Keep just the "Proxy: ..." line visible below the last action's output
+        print(f"\n(status unchanged: {lines[3]})")
+        return
+    _last_status = lines
+    print("\n".join(lines))
 
 
 def run_script(script_name: str, args: list[str] | None = None, env: Optional[Dict[str, str]] = None) -> int:
     """Execute a bash script in ./scripts with passthrough output."""
+    impl = _PY_IMPLS.get(script_name)
+    if impl is not None:
+        code, out, err = impl(args or [], env)
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+        return code
     script_path = SCRIPTS_DIR / script_name
     if not script_path.exists():
         print(f"⚠️  Script missing: {script_path}")
         return 1
-    cmd = ["bash", str(script_path)]
+    cmd = [BASH, str(script_path)]
     if args:
         cmd.extend(args)
     try:
@@ -143,10 +284,18 @@ def run_script(script_name: str, args: list[str] | None = None, env: Optional[Di
 
 
 def capture_script_output(script_name: str, args: list[str]) -> Optional[str]:
+    impl = _PY_IMPLS.get(script_name)
+    if impl is not None:
+        code, out, err = impl(args, None)
+        if code != 0:
+            print(out, end="")
+            print(err, end="", file=sys.stderr)
+            return None
+        return out.strip()
     script_path = SCRIPTS_DIR / script_name
     try:
         completed = subprocess.run(
-            ["bash", str(script_path), *args],
+            [BASH, str(script_path), *args],
             cwd=REPO_ROOT,
             check=True,
             capture_output=True,
@@ -173,6 +322,31 @@ def start_proxy_menu() -> None:
         print(f"⚠️  Start script exited with code {code}. Review the output above and logs in {RUNTIME_DIR}")
 
 
+def _signal_service(pid: int, sig: int) -> bool:
+    """Signal pid's whole process group when it leads one, else just pid."""
+    try:
+        pgid = os.getpgid(pid)
+        # Daemons started by start_proxy_and_tunnel.sh lead their own group;
+        # never signal a group we belong to ourselves
+        if pgid == pid and pgid != os.getpgrp():
+            os.killpg(pgid, sig)
+        else:
+            os.kill(pid, sig)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
 def stop_services_menu() -> None:
     print("\n⏹️  Stopping proxy and tunnel processes...")
     pid_files = [
@@ -190,12 +364,21 @@ def stop_services_menu() -> None:
         except ValueError:
             pid_file.unlink(missing_ok=True)
             continue
-        try:
-            os.kill(pid, signal.SIGTERM)
-            stopped.append((pid_file.name, pid))
-        except ProcessLookupError:
-            stopped.append((pid_file.name, pid))
+        stopped.append((pid_file.name, pid))
         pid_file.unlink(missing_ok=True)
+
+    # Signal everything first, then wait once for the lot
+    for _, pid in stopped:
+        _signal_service(pid, signal.SIGTERM)
+    remaining = {pid for _, pid in stopped}
+    deadline = time.monotonic() + STOP_GRACE_PERIOD
+    while remaining and time.monotonic() < deadline:
+        remaining = {pid for pid in remaining if _pid_running(pid)}
+        if remaining:
+            time.sleep(0.05)
+    for pid in remaining:
+        if _signal_service(pid, signal.SIGKILL):
+            print(f"   • pid {pid} ignored SIGTERM; killed")
     if stopped:
         for name, pid in stopped:
             print(f"   • Terminated {name} (pid {pid})")
@@ -210,8 +393,13 @@ def ensure_token_available() -> bool:
 
 
 def read_token() -> Optional[str]:
+    global _token_cache
+    if _token_cache is not None and time.monotonic() - _token_cache[0] < TOKEN_CACHE_TTL:
+        return _token_cache[1]
     output = capture_script_output("manage_auth_token.sh", ["print"])
-    return output.strip() if output else None
+    token = output.strip() if output else None
+    _token_cache = (time.monotonic(), token) if token else None
+    return token
 
 
 def show_connection_info() -> None:
@@ -265,8 +453,10 @@ def show_connection_info() -> None:
 
 
 def rotate_token_menu() -> None:
+    global _token_cache
     print("\n🔄 Rotating tools token...")
     code = run_script("manage_auth_token.sh", ["rotate"])
+    _token_cache = None
     if code == 0:
         print("✅ Token rotated. Remember to restart the proxy so new sessions use the updated token.")
     else:
@@ -382,30 +572,38 @@ def add_learning_note_menu() -> None:
     print("✅ Saved. Future sessions can surface this note when searching memories.")
 
 
+def _read_choice(prompt: str) -> str:
+    """Like input(prompt), but repaint the status while the operator is idle.
+
+    Waits on stdin with select instead of blocking in input(), re-polling the
+    proxy every STATUS_REFRESH_INTERVAL seconds and redrawing status, menu and
+    prompt only when the status text changed.
+    """
+    if os.name == "nt" or not sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    with selectors.DefaultSelector() as sel:
+        sel.register(sys.stdin, selectors.EVENT_READ)
+        while not sel.select(timeout=STATUS_REFRESH_INTERVAL):
+            lines = _status_lines()
+            if lines != _last_status:
+                sys.stdout.write("\n")
+                display_status()
+                sys.stdout.write(MENU_TEXT + prompt)
+                sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
 def main() -> None:
     ensure_runtime_dir()
     while True:
         display_status()
-        print(
-            textwrap.dedent(
-                """
-                Menu
-                -----------------------------------------
-                1.  Start proxy & tunnel
-                2.  Stop proxy & tunnel
-                3.  Show connection instructions
-                4.  Rotate tools token
-                5.  Run health check
-                6.  Run self-test
-                7.  Generate access pack
-                8.  Open logs folder
-                9.  Review learning log
-                10. Add learning note
-                11. Exit
-                """
-            )
-        )
-        choice = input("Select an option (1-11): ").strip()
+        sys.stdout.write(MENU_TEXT)
+        choice = _read_choice(MENU_PROMPT).strip()
         if choice == "1":
             start_proxy_menu()
         elif choice == "2":
@@ -431,7 +629,6 @@ def main() -> None:
             break
         else:
             print("Please enter a number between 1 and 11.")
-        time.sleep(0.5)
 
 
 if __name__ == "__main__":
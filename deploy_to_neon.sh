@@ -26,6 +26,8 @@ cat > /tmp/requirements.txt << 'EOF'
 fastapi==0.104.1
 websockets==12.0
 uvicorn==0.24.0
+uvloop==0.19.0
+httptools==0.6.1
 pymilvus==2.3.0
 requests==2.31.0
 EOF
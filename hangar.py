@@ -29,17 +29,24 @@ Usage:
     python hangar.py collect               # Gather results from all bays
 """
 
-import asyncio
-import subprocess
+# asyncio (~30ms) and argparse are imported where used, so quick CLI
+# commands like status/list don't pay for the launch machinery
 import json
+import mmap
 import os
+import shutil
 import sys
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import argparse
+from dataclasses import dataclass, asdict, field
+from typing import Optional, List, Dict, Any, Iterator
+
+# orjson is optional; fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # ==============================================================================
@@ -51,7 +58,7 @@ STATE_FILE = HANGAR_DIR / "fleet_state.json"
 DEFAULT_MODEL = "haiku"  # Fast and cheap for parallel work
 
 
-@dataclass
+@dataclass(slots=True)
 class Bay:
     """A single bay in the hangar."""
     name: str
@@ -63,13 +70,31 @@ class Bay:
     completed_at: Optional[str] = None
     output_file: Optional[str] = None
     error: Optional[str] = None
+    # CLAUDE.md contents, loaded by discover_bays; not persisted to state
+    instructions: str = field(default="", repr=False)
 
     def to_dict(self) -> Dict:
         d = asdict(self)
+        del d['instructions']
         d['path'] = str(d['path'])
         d['claude_md'] = str(d['claude_md'])
         return d
 
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Bay":
+        """Rebuild a Bay from its to_dict() form (as saved in STATE_FILE)."""
+        return cls(
+            name=d['name'],
+            path=Path(d['path']),
+            claude_md=Path(d['claude_md']),
+            status=d['status'],
+            pid=d['pid'],
+            started_at=d['started_at'],
+            completed_at=d['completed_at'],
+            output_file=d['output_file'],
+            error=d['error']
+        )
+
 
 @dataclass
 class FleetState:
@@ -99,105 +124,208 @@ def discover_bays(hangar_path: Path) -> List[Bay]:
     """
     bays = []
 
-    for item in sorted(hangar_path.iterdir()):
-        if item.is_dir() and not item.name.startswith('.'):
-            claude_md = item / "CLAUDE.md"
-            if claude_md.exists():
-                bays.append(Bay(
-                    name=item.name,
-                    path=item,
-                    claude_md=claude_md
-                ))
+    # DirEntry carries the file type from the directory read, so no stat
+    # per entry; opening CLAUDE.md directly doubles as the existence check
+    with os.scandir(hangar_path) as it:
+        entries = sorted(
+            (e for e in it if e.is_dir() and not e.name.startswith('.')),
+            key=lambda e: e.name
+        )
+
+    for entry in entries:
+        item = Path(entry.path)
+        claude_md = item / "CLAUDE.md"
+        try:
+            instructions = claude_md.read_text()
+        except FileNotFoundError:
+            continue
+        bays.append(Bay(
+            name=entry.name,
+            path=item,
+            claude_md=claude_md,
+            instructions=instructions
+        ))
 
     return bays
 
 
 def read_bay_instructions(bay: Bay) -> str:
     """Read the CLAUDE.md instructions for a bay."""
-    return bay.claude_md.read_text()
+    if not bay.instructions:
+        bay.instructions = bay.claude_md.read_text()
+    return bay.instructions
 
 
 # ==============================================================================
 # Fleet Operations
 # ==============================================================================
 
-def launch_single_bay(
+def _prompt_suffix(mission: str) -> str:
+    """Everything in a bay's prompt after its CLAUDE.md instructions."""
+    return (
+        f"\n\n# Current Mission\n{mission}\n\n"
+        "# Output\n"
+        "Complete your assigned portion of the mission. Be thorough but focused on your specialty."
+    )
+
+
+def _command_prefix(model: str) -> tuple:
+    """claude argv up to the prompt (absolute path so spawns skip the PATH search)."""
+    return (
+        shutil.which("claude") or "claude",
+        "--print",
+        "--dangerously-skip-permissions",
+        "--model", model,
+        "--prompt"
+    )
+
+
+async def launch_single_bay(
     bay: Bay,
     mission: str,
     model: str = DEFAULT_MODEL,
-    timeout: int = 600
+    timeout: int = 600,
+    prompt_suffix: Optional[str] = None,
+    cmd_prefix: Optional[tuple] = None
 ) -> Bay:
     """
     Launch Claude Code in a single bay.
 
+    prompt_suffix and cmd_prefix depend only on mission and model; fleet
+    launches build them once and pass them in.
+
     Returns updated Bay with status.
     """
+    import asyncio
+
     bay.status = "launching"
-    bay.started_at = datetime.now().isoformat()
+    started = datetime.now()
+    bay.started_at = started.isoformat()
 
     # Create output file for this bay
-    output_file = HANGAR_DIR / f"{bay.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    output_file = HANGAR_DIR / f"{bay.name}_{started.strftime('%Y%m%d_%H%M%S')}.log"
     bay.output_file = str(output_file)
 
     # Build the prompt combining bay instructions + mission
-    bay_instructions = read_bay_instructions(bay)
-    full_prompt = f"""# Bay Instructions
-{bay_instructions}
-
-# Current Mission
-{mission}
-
-# Output
-Complete your assigned portion of the mission. Be thorough but focused on your specialty."""
-
-    # Build command
-    cmd = [
-        "claude",
-        "--print",
-        "--dangerously-skip-permissions",
-        "--model", model,
-        "--prompt", full_prompt
-    ]
+    if prompt_suffix is None:
+        prompt_suffix = _prompt_suffix(mission)
+    if cmd_prefix is None:
+        cmd_prefix = _command_prefix(model)
+    cmd = [*cmd_prefix, "# Bay Instructions\n" + read_bay_instructions(bay) + prompt_suffix]
 
     try:
         bay.status = "running"
 
-        with open(output_file, 'w') as f:
-            result = subprocess.run(
-                cmd,
+        with open(output_file, 'wb') as f:
+            f.write(
+                f"=== Bay: {bay.name} ===\n"
+                f"Started: {bay.started_at}\n"
+                f"Model: {model}\n"
+                f"Working Dir: {bay.path}\n"
+                f"\n=== STDOUT ===\n".encode()
+            )
+            f.flush()
+
+            # stdout goes straight to the log via the inherited fd; only
+            # stderr (usually small) passes through Python. close_fds=False
+            # skips the per-spawn sweep over every possible fd; Python's own
+            # fds are already non-inheritable (PEP 446)
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
                 cwd=str(bay.path),
-                capture_output=True,
-                text=True,
-                timeout=timeout
+                stdout=f,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False
             )
+            bay.pid = proc.pid
+
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                f.seek(0, os.SEEK_END)
+                f.write(f"\n\n=== Return Code: killed after {timeout}s timeout ===\n".encode())
+                raise
+
+            stderr = stderr.decode("utf-8", errors="replace")
 
-            f.write(f"=== Bay: {bay.name} ===\n")
-            f.write(f"Started: {bay.started_at}\n")
-            f.write(f"Model: {model}\n")
-            f.write(f"Working Dir: {bay.path}\n")
-            f.write(f"\n=== STDOUT ===\n{result.stdout}\n")
-            if result.stderr:
-                f.write(f"\n=== STDERR ===\n{result.stderr}\n")
-            f.write(f"\n=== Return Code: {result.returncode} ===\n")
+            # The child advanced the shared file offset; append after it
+            f.seek(0, os.SEEK_END)
+            f.write(b"\n")
+            if stderr:
+                f.write(f"\n=== STDERR ===\n{stderr}\n".encode())
+            f.write(f"\n=== Return Code: {proc.returncode} ===\n".encode())
 
-        bay.status = "completed" if result.returncode == 0 else "failed"
-        bay.completed_at = datetime.now().isoformat()
+        bay.status = "completed" if proc.returncode == 0 else "failed"
 
-        if result.returncode != 0:
-            bay.error = result.stderr[:500] if result.stderr else "Non-zero exit"
+        if proc.returncode != 0:
+            bay.error = stderr[:500] if stderr else "Non-zero exit"
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         bay.status = "failed"
         bay.error = f"Timeout after {timeout}s"
-        bay.completed_at = datetime.now().isoformat()
     except Exception as e:
         bay.status = "failed"
         bay.error = str(e)
-        bay.completed_at = datetime.now().isoformat()
 
+    bay.completed_at = datetime.now().isoformat()
     return bay
 
 
+def _pidfd_supported() -> bool:
+    """Linux 5.3+ can wait on a child via a pollable pidfd."""
+    if not hasattr(os, "pidfd_open"):
+        return False
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return False
+    return True
+
+
+async def _launch_bays(
+    bays: List[Bay],
+    mission: str,
+    model: str,
+    max_parallel: int,
+    timeout: int
+) -> None:
+    """Run all bays on one event loop, at most max_parallel at a time."""
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_parallel)
+    prompt_suffix = _prompt_suffix(mission)
+    cmd_prefix = _command_prefix(model)
+
+    # Before 3.12 asyncio reaps each child with its own blocking waitpid()
+    # thread. Where pidfds work, have the event loop poll them instead, so
+    # every bay is reaped from the one loop thread. (3.12+ does this itself;
+    # macOS keeps the default watcher.)
+    watcher = None
+    if sys.version_info < (3, 12) and _pidfd_supported():
+        watcher = asyncio.PidfdChildWatcher()
+        watcher.attach_loop(asyncio.get_running_loop())
+        asyncio.set_child_watcher(watcher)
+
+    async def guarded(bay: Bay) -> None:
+        async with semaphore:
+            try:
+                await launch_single_bay(bay, mission, model, timeout, prompt_suffix, cmd_prefix)
+            except Exception as e:
+                print(f"   ✗ {bay.name}: Exception - {e}")
+                return
+
+        status_icon = "✓" if bay.status == "completed" else "✗"
+        print(f"   {status_icon} {bay.name}: {bay.status}")
+
+    try:
+        await asyncio.gather(*(guarded(bay) for bay in bays))
+    finally:
+        if watcher is not None:
+            asyncio.set_child_watcher(None)
+
+
 def launch_fleet(
     hangar_path: Path,
     mission: str,
@@ -220,6 +348,8 @@ def launch_fleet(
     Returns:
         FleetState with results
     """
+    import asyncio
+
     # Ensure state directory exists
     HANGAR_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -244,24 +374,8 @@ def launch_fleet(
     print(f"   Parallel: {max_parallel}")
     print()
 
-    # Launch in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
-        futures = {
-            executor.submit(launch_single_bay, bay, mission, model, timeout): bay
-            for bay in bays
-        }
-
-        for future in as_completed(futures):
-            bay = futures[future]
-            try:
-                updated_bay = future.result()
-                idx = next(i for i, b in enumerate(bays) if b.name == updated_bay.name)
-                bays[idx] = updated_bay
-
-                status_icon = "✓" if updated_bay.status == "completed" else "✗"
-                print(f"   {status_icon} {updated_bay.name}: {updated_bay.status}")
-            except Exception as e:
-                print(f"   ✗ {bay.name}: Exception - {e}")
+    # Launch in parallel; each bay is a subprocess, all driven by one event loop
+    asyncio.run(_launch_bays(bays, mission, model, max_parallel, timeout))
 
     # Create fleet state
     state = FleetState(
@@ -272,7 +386,7 @@ def launch_fleet(
     )
 
     # Save state
-    STATE_FILE.write_text(json.dumps(state.to_dict(), indent=2))
+    save_state(state)
 
     # Summary
     completed = sum(1 for b in bays if b.status == "completed")
@@ -286,38 +400,76 @@ def launch_fleet(
     return state
 
 
-def collect_results(state: FleetState) -> str:
+# Bay log section markers; stdout runs up to the stderr/return-code footer,
+# or to end of file if the bay died before writing one.
+_STDOUT_MARK = b"=== STDOUT ==="
+_STDOUT_END_MARKS = (b"=== STDERR ===", b"=== Return Code")
+
+
+def _read_bay_stdout(path: Path) -> Optional[str]:
+    """Extract the stdout block from a bay log without reading the rest."""
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(_STDOUT_MARK)
+            if start < 0:
+                return None
+            start += len(_STDOUT_MARK)
+            for mark in _STDOUT_END_MARKS:
+                end = mm.find(mark, start)
+                if end >= 0:
+                    break
+            else:
+                end = len(mm)
+            return mm[start:end].strip().decode("utf-8", errors="replace")
+
+
+def save_state(state: FleetState) -> None:
+    """Write STATE_FILE atomically so an interrupted save never leaves it half-written."""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(state.to_dict(), option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(state.to_dict(), indent=2).encode()
+    tmp = STATE_FILE.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, STATE_FILE)
+
+
+def load_state_dict() -> Dict[str, Any]:
+    """Parse STATE_FILE straight from bytes (orjson when available)."""
+    data = STATE_FILE.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def iter_results(state: FleetState) -> Iterator[str]:
     """
-    Collect and combine results from all bays.
+    Yield the combined results document one bay at a time.
 
-    Returns combined output as a single document.
+    Each chunk ends with a newline; only one bay's output is held at once.
     """
-    results = []
-    results.append(f"# Fleet Results")
-    results.append(f"Mission: {state.mission}")
-    results.append(f"Launched: {state.launched_at}")
-    results.append("")
+    yield f"# Fleet Results\nMission: {state.mission}\nLaunched: {state.launched_at}\n\n"
 
     for bay in state.bays:
-        results.append(f"## {bay.name}")
-        results.append(f"Status: {bay.status}")
+        chunk = f"## {bay.name}\nStatus: {bay.status}\n"
 
         if bay.output_file and Path(bay.output_file).exists():
-            output = Path(bay.output_file).read_text()
-            # Extract just the stdout portion
-            if "=== STDOUT ===" in output:
-                stdout = output.split("=== STDOUT ===")[1]
-                if "=== STDERR ===" in stdout:
-                    stdout = stdout.split("=== STDERR ===")[0]
-                elif "=== Return Code" in stdout:
-                    stdout = stdout.split("=== Return Code")[0]
-                results.append(stdout.strip())
+            stdout = _read_bay_stdout(Path(bay.output_file))
+            if stdout is not None:
+                chunk += f"{stdout}\n"
         elif bay.error:
-            results.append(f"Error: {bay.error}")
+            chunk += f"Error: {bay.error}\n"
 
-        results.append("")
+        yield chunk + "\n"
 
-    return "\n".join(results)
+
+def collect_results(state: FleetState) -> str:
+    """
+    Collect and combine results from all bays.
+
+    Returns combined output as a single document.
+    """
+    return "".join(iter_results(state))[:-1]
 
 
 # ==============================================================================
@@ -411,6 +563,8 @@ All relevant files for your work are in this directory or its subdirectories.
 # ==============================================================================
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="The Hangar - Fleet Spawning System",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -474,24 +628,28 @@ Examples:
 
     elif args.command == "status":
         if STATE_FILE.exists():
-            state = json.loads(STATE_FILE.read_text())
-            print(json.dumps(state, indent=2))
+            state = load_state_dict()
+            if ORJSON_AVAILABLE:
+                sys.stdout.buffer.write(
+                    orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+                )
+            else:
+                print(json.dumps(state, indent=2))
         else:
             print("No fleet state found. Launch a fleet first.")
 
     elif args.command == "collect":
         if STATE_FILE.exists():
-            state_dict = json.loads(STATE_FILE.read_text())
+            state_dict = load_state_dict()
             # Reconstruct FleetState
-            bays = [Bay(**{k: Path(v) if k in ['path', 'claude_md'] else v
-                          for k, v in b.items()}) for b in state_dict['bays']]
+            bays = [Bay.from_dict(b) for b in state_dict['bays']]
             state = FleetState(
                 hangar_path=state_dict['hangar_path'],
                 mission=state_dict['mission'],
                 launched_at=state_dict['launched_at'],
                 bays=bays
             )
-            print(collect_results(state))
+            sys.stdout.writelines(iter_results(state))
         else:
             print("No fleet state found. Launch a fleet first.")
 
@@ -9,6 +9,46 @@ import re
 from pathlib import Path
 
 
+# Endpoint prologues to rewrite, old -> new. All are matched by one
+# alternation so the server source is scanned once instead of per endpoint.
+_ENDPOINT_REWRITES = {
+    # Update fs_ls endpoint
+    'def fs_ls(path: Optional[str] = None, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)':
+        'def fs_ls(path: Optional[str] = None, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(path or str(BASE_DIR))\n    token_fp = _require_auth(authorization, operation="fs_ls", path=tgt)',
+    # Update fs_read endpoint
+    'def fs_read(path: str, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)\n    tgt = _resolve_path(path)':
+        'def fs_read(path: str, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(path)\n    token_fp = _require_auth(authorization, operation="fs_read", path=tgt)',
+    # Update fs_write endpoint
+    'def fs_write(body: FSWriteBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)':
+        'def fs_write(body: FSWriteBody, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(body.path)\n    token_fp = _require_auth(authorization, operation="fs_write", path=tgt)',
+    # Update fs_mkdir endpoint
+    'def fs_mkdir(body: FSMkdirBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)':
+        'def fs_mkdir(body: FSMkdirBody, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(body.path)\n    token_fp = _require_auth(authorization, operation="fs_mkdir", path=tgt)',
+    # Update fs_rm endpoint
+    'def fs_rm(body: FSRmBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)':
+        'def fs_rm(body: FSRmBody, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(body.path)\n    token_fp = _require_auth(authorization, operation="fs_rm", path=tgt)',
+    # Update exec endpoint
+    'def exec_cmd(body: ExecBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)\n    cmd = list(body.cmd)':
+        'def exec_cmd(body: ExecBody, authorization: Optional[str] = Header(None)):\n    cmd = list(body.cmd)\n    if body.sudo:\n        cmd = ["sudo"] + cmd\n    token_fp = _require_auth(authorization, operation="exec", command=cmd)',
+}
+_ENDPOINT_RE = re.compile("|".join(map(re.escape, _ENDPOINT_REWRITES)))
+
+_MEMORY_IMPORT_RE = re.compile(r"(from starlette\.background import BackgroundTask\n)")
+_HEALTH_RE = re.compile(r"(@app\.get\(\"/health\"\)\ndef health\(\) -> dict:\n    return \{\"status\": \"ok\", \"backend\": BACKEND, \"model\": DEFAULT_MODEL\})\n")
+_REQUIRE_AUTH_RE = re.compile(r"""def _require_auth\(authorization: Optional\[str\]\) -> Optional\[str\]:
+    if AUTH_TOKENS:  # Only enforce if at least one token is configured
+        if not authorization or not authorization\.startswith\(\"Bearer \"\):
+            _log_event\(\"auth_failure\", reason=\"missing_header\"\)
+            raise HTTPException\(status_code=401, detail=\"Missing/invalid Authorization header\"\)
+        token = authorization\.split\(\" \", 1\)\[1\]
+        if token not in AUTH_TOKENS:
+            _log_event\(\"auth_failure\", reason=\"invalid_token\"\)
+            raise HTTPException\(status_code=403, detail=\"Invalid token\"\)
+        return _enforce_rate_limit\(token\)
+    return None""", re.MULTILINE | re.DOTALL)
+_BATCH_RE = re.compile(r'(def batch\(req: BatchRequest, authorization: Optional\[str\] = Header\(None\)\):)\n    token_fp = _require_auth\(authorization\)')
+
+
 def integrate_security():
     """Integrate security system into local_agent_server.py"""
     
@@ -47,13 +87,7 @@ except ImportError as e:
 """
     
     # Find the spot after memory import
-    memory_import_pattern = r"(from starlette\.background import BackgroundTask\n)"
-    content = re.sub(
-        memory_import_pattern,
-        r"\1" + security_imports + "\n",
-        content,
-        count=1
-    )
+    content = _MEMORY_IMPORT_RE.sub(r"\1" + security_imports + "\n", content, count=1)
     
     # 2. Add security initialization after app creation
     security_init = """
@@ -63,23 +97,15 @@ except ImportError as e:
 SECURITY_ENHANCED = False
 if SECURITY_AVAILABLE:
     try:
-        # Change to Trapdoor directory for config loading
-        original_cwd = Path.cwd()
-        if TRAPDOOR_REPO_DIR.exists():
-            import os
-            os.chdir(TRAPDOOR_REPO_DIR)
-        
         token_manager, rate_limiter, approval_queue = setup_security(
             config_path=TRAPDOOR_REPO_DIR / "config" / "tokens.json",
-            auto_migrate=True  # Automatically migrate from AUTH_TOKEN
+            auto_migrate=True,  # Automatically migrate from AUTH_TOKEN
+            base_dir=TRAPDOOR_REPO_DIR
         )
         
         # Register approval management endpoints
         register_approval_endpoints(app, token_manager, approval_queue)
         
-        # Restore original directory
-        os.chdir(original_cwd)
-        
         print("✅ Enhanced security system enabled")
         print(f"   Loaded {len(token_manager.tokens)} tokens")
         SECURITY_ENHANCED = True
@@ -93,27 +119,9 @@ else:
 """
     
     # Find spot after health endpoint
-    health_pattern = r"(@app\.get\(\"/health\"\)\ndef health\(\) -> dict:\n    return \{\"status\": \"ok\", \"backend\": BACKEND, \"model\": DEFAULT_MODEL\})\n"
-    content = re.sub(
-        health_pattern,
-        r"\1\n\n" + security_init,
-        content,
-        count=1
-    )
+    content = _HEALTH_RE.sub(r"\1\n\n" + security_init, content, count=1)
     
     # 3. Update _require_auth function to use enhanced security
-    old_require_auth = r"""def _require_auth\(authorization: Optional\[str\]\) -> Optional\[str\]:
-    if AUTH_TOKENS:  # Only enforce if at least one token is configured
-        if not authorization or not authorization\.startswith\(\"Bearer \"\):
-            _log_event\(\"auth_failure\", reason=\"missing_header\"\)
-            raise HTTPException\(status_code=401, detail=\"Missing/invalid Authorization header\"\)
-        token = authorization\.split\(\" \", 1\)\[1\]
-        if token not in AUTH_TOKENS:
-            _log_event\(\"auth_failure\", reason=\"invalid_token\"\)
-            raise HTTPException\(status_code=403, detail=\"Invalid token\"\)
-        return _enforce_rate_limit\(token\)
-    return None"""
-    
     new_require_auth = """def _require_auth(authorization: Optional[str], operation: str = "legacy", path: Optional[Path] = None, command: Optional[List[str]] = None) -> Optional[str]:
     \"\"\"
     Authentication wrapper with optional enhanced security
@@ -147,48 +155,14 @@ else:
         return _enforce_rate_limit(token)
     return None"""
     
-    content = re.sub(old_require_auth, new_require_auth, content, count=1, flags=re.MULTILINE | re.DOTALL)
-    
-    # 4. Update fs_ls endpoint
-    content = content.replace(
-        'def fs_ls(path: Optional[str] = None, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)',
-        'def fs_ls(path: Optional[str] = None, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(path or str(BASE_DIR))\n    token_fp = _require_auth(authorization, operation="fs_ls", path=tgt)'
-    )
+    content = _REQUIRE_AUTH_RE.sub(new_require_auth, content, count=1)
     
-    # 5. Update fs_read endpoint
-    content = content.replace(
-        'def fs_read(path: str, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)\n    tgt = _resolve_path(path)',
-        'def fs_read(path: str, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(path)\n    token_fp = _require_auth(authorization, operation="fs_read", path=tgt)'
-    )
-    
-    # 6. Update fs_write endpoint
-    content = content.replace(
-        'def fs_write(body: FSWriteBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)',
-        'def fs_write(body: FSWriteBody, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(body.path)\n    token_fp = _require_auth(authorization, operation="fs_write", path=tgt)'
-    )
-    
-    # 7. Update fs_mkdir endpoint
-    content = content.replace(
-        'def fs_mkdir(body: FSMkdirBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)',
-        'def fs_mkdir(body: FSMkdirBody, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(body.path)\n    token_fp = _require_auth(authorization, operation="fs_mkdir", path=tgt)'
-    )
-    
-    # 8. Update fs_rm endpoint
-    content = content.replace(
-        'def fs_rm(body: FSRmBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)',
-        'def fs_rm(body: FSRmBody, authorization: Optional[str] = Header(None)):\n    tgt = _resolve_path(body.path)\n    token_fp = _require_auth(authorization, operation="fs_rm", path=tgt)'
-    )
-    
-    # 9. Update exec endpoint
-    content = content.replace(
-        'def exec_cmd(body: ExecBody, authorization: Optional[str] = Header(None)):\n    token_fp = _require_auth(authorization)\n    cmd = list(body.cmd)',
-        'def exec_cmd(body: ExecBody, authorization: Optional[str] = Header(None)):\n    cmd = list(body.cmd)\n    if body.sudo:\n        cmd = ["sudo"] + cmd\n    token_fp = _require_auth(authorization, operation="exec", command=cmd)'
-    )
+    # 4-9. Update fs_ls/fs_read/fs_write/fs_mkdir/fs_rm/exec endpoints in one pass
+    content = _ENDPOINT_RE.sub(lambda m: _ENDPOINT_REWRITES[m.group(0)], content)
     
     # 10. Update batch endpoint - add operation-specific auth
-    batch_pattern = r'(def batch\(req: BatchRequest, authorization: Optional\[str\] = Header\(None\)\):)\n    token_fp = _require_auth\(authorization\)'
     batch_replacement = r'\1\n    # Validate auth once for batch\n    token_fp = _require_auth(authorization, operation="batch")'
-    content = re.sub(batch_pattern, batch_replacement, content)
+    content = _BATCH_RE.sub(batch_replacement, content)
     
     # Write the updated file
     with open(server_file, "w", encoding="utf-8") as f:
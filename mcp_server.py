@@ -10,9 +10,14 @@
 
 import sys
 import os
+import atexit
+import functools
+import queue
+import shlex
 import shutil
 import subprocess
 import threading
+import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Sequence
 
@@ -49,6 +54,24 @@ ALLOW_ABSOLUTE = os.getenv("ALLOW_ABSOLUTE", "1") == "1"
 # Default to ALLOW_SUDO=1 per user permission
 ALLOW_SUDO = os.getenv("ALLOW_SUDO", "1") == "1" 
 TRAPDOOR_ROOT = Path(__file__).parent
+# Larger files are refused rather than pulled into memory and the reply
+MAX_READ_BYTES = int(os.getenv("MAX_READ_BYTES", str(10 * 1024 * 1024)))
+SUDO_BINS = frozenset({"sudo", "/usr/bin/sudo", "/bin/sudo"})
+# Commands using any of these need /bin/sh (pipes, redirects, globs, $vars...)
+SHELL_METACHARS = frozenset("|&;<>()$`*?[]{}~#\n")
+# Shell builtins and reserved words have no executable on PATH (or one that
+# can't act on the caller, like cd/umask), so they also need /bin/sh
+SHELL_BUILTINS = frozenset({
+    ".", ":", "alias", "bg", "break", "builtin", "cd", "command", "continue",
+    "declare", "dirs", "eval", "exec", "exit", "export", "fc", "fg", "getopts",
+    "hash", "jobs", "let", "local", "popd", "pushd", "read", "readonly",
+    "return", "set", "shift", "source", "times", "trap", "type", "typeset",
+    "ulimit", "umask", "unalias", "unset", "wait",
+    # reserved words
+    "!", "[[", "]]", "case", "coproc", "do", "done", "elif", "else", "esac",
+    "fi", "for", "function", "if", "in", "select", "then", "time", "until",
+    "while", "{", "}",
+})
 
 # Initialize Security
 token_manager = None
@@ -92,24 +115,70 @@ def _check_perm(operation: str, path: Optional[Path] = None, command: Optional[L
     except PermissionError as e:
         raise RuntimeError(f"Permission denied: {str(e)}")
 
-def _resolve_path(p: str) -> Path:
+@functools.lru_cache(maxsize=1024)
+def _resolve_cached(p: str, base: Path, allow_abs: bool) -> Path:
+    """expanduser + resolve (readlink/stat per component), memoized per input"""
     path = Path(p).expanduser()
-    if not ALLOW_ABSOLUTE and not path.is_absolute():
-        path = (BASE_DIR / path).resolve()
-    else:
-        path = path.resolve()
+    if not allow_abs and not path.is_absolute():
+        return (base / path).resolve()
+    return path.resolve()
+
+def _resolve_path(p: str) -> Path:
+    path = _resolve_cached(p, BASE_DIR, ALLOW_ABSOLUTE)
     
     if not ALLOW_ABSOLUTE and BASE_DIR not in path.parents and path != BASE_DIR:
         raise RuntimeError(f"Path outside BASE_DIR not allowed: {path}")
     
     return path
 
+# Memory events are written by a background thread so tools never wait on
+# disk; if the writer falls this far behind, new events are dropped
+MEMORY_QUEUE_MAX = 10000
+_memory_queue: "queue.Queue[tuple[float, str, Dict[str, Any]]]" = queue.Queue(MEMORY_QUEUE_MAX)
+
+_MEMORY_STOP = object()  # queued at exit; the writer returns once it sees it
+MEMORY_STOP_TIMEOUT = 5.0
+
+def _memory_writer():
+    while True:
+        item = _memory_queue.get()
+        batch = []
+        while item is not _MEMORY_STOP:
+            batch.append(item)
+            try:
+                item = _memory_queue.get_nowait()
+            except queue.Empty:
+                break
+        if batch:
+            try:
+                memory_store.record_events(batch)
+            except Exception as e:
+                print(f"memory-writer: dropped {len(batch)} events: {e}", file=sys.stderr)
+        if item is _MEMORY_STOP:
+            return
+
+def _stop_memory_writer():
+    """Let the writer finish queued and in-flight batches before exit"""
+    try:
+        _memory_queue.put(_MEMORY_STOP, timeout=MEMORY_STOP_TIMEOUT)
+    except queue.Full:
+        print("memory-writer: queue still full at exit, events lost", file=sys.stderr)
+        return
+    _memory_writer_thread.join(MEMORY_STOP_TIMEOUT)
+    if _memory_writer_thread.is_alive():
+        print("memory-writer: did not finish before exit, events lost", file=sys.stderr)
+
+if MEMORY_AVAILABLE:
+    _memory_writer_thread = threading.Thread(target=_memory_writer, name="memory-writer", daemon=True)
+    _memory_writer_thread.start()
+    atexit.register(_stop_memory_writer)
+
 def _log_memory(kind: str, data: Dict[str, Any]):
-    """Record event to Trapdoor memory if available"""
+    """Queue an event for Trapdoor memory if available"""
     if MEMORY_AVAILABLE and memory_store:
         try:
-            memory_store.record_event(kind, data)
-        except Exception:
+            _memory_queue.put_nowait((time.time(), kind, data))
+        except queue.Full:
             pass
 
 # ============================================================
@@ -135,10 +204,12 @@ def ls(path: str = ".") -> str:
             stat = target.stat()
             return f"File: {target.name}\nSize: {stat.st_size} bytes"
             
-        entries = []
-        for entry in sorted(target.iterdir()):
-            prefix = "[DIR] " if entry.is_dir() else "[FILE]"
-            entries.append(f"{prefix} {entry.name}")
+        # DirEntry.is_dir() uses the type from the directory read (no stat per entry)
+        with os.scandir(target) as it:
+            entries = [
+                f"{'[DIR] ' if entry.is_dir() else '[FILE]'} {entry.name}"
+                for entry in sorted(it, key=lambda e: e.name)
+            ]
             
         result = "\n".join(entries)
         _log_memory("fs_ls", {"path": str(target), "entries": len(entries)})
@@ -163,12 +234,25 @@ def read(path: str) -> str:
         if not target.is_file():
             return f"Error: Not a file: {target}"
             
+        size = target.stat().st_size
+        if size > MAX_READ_BYTES:
+            return f"Error: File too large ({size} bytes, limit {MAX_READ_BYTES}): {target.name}"
+
+        # Sniff the first block so binaries are rejected without a full read
+        with target.open("rb") as fh:
+            head = fh.read(4096)
+            if b"\x00" in head:
+                return f"Error: Binary file detected (cannot display text): {target.name}"
+            data = head + fh.read()
         try:
-            content = target.read_text(encoding="utf-8")
-            _log_memory("fs_read", {"path": str(target), "bytes": len(content)})
-            return content
+            content = data.decode("utf-8")
         except UnicodeDecodeError:
             return f"Error: Binary file detected (cannot display text): {target.name}"
+        if "\r" in content:
+            # Match read_text()'s universal-newline translation
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        _log_memory("fs_read", {"path": str(target), "bytes": len(data)})
+        return content
             
     except Exception as e:
         return f"Error: {str(e)}"
@@ -207,6 +291,7 @@ def mkdir(path: str) -> str:
         _check_perm("fs_mkdir", path=target)
         
         target.mkdir(parents=True, exist_ok=True)
+        _resolve_cached.cache_clear()
         _log_memory("fs_mkdir", {"path": str(target)})
         return f"Created directory: {target}"
     except Exception as e:
@@ -239,12 +324,22 @@ def rm(path: str, recursive: bool = False) -> str:
         else:
             target.unlink()
             msg = f"Removed file: {target}"
+        # Removed symlinks/dirs may have changed how cached paths resolve
+        _resolve_cached.cache_clear()
             
         _log_memory("fs_rm", {"path": str(target), "recursive": recursive})
         return msg
     except Exception as e:
         return f"Error: {str(e)}"
 
+def _needs_shell(command: str, cmd_list: Sequence[str]) -> bool:
+    """Only start a shell when the command uses shell syntax or a builtin"""
+    return (
+        not SHELL_METACHARS.isdisjoint(command)
+        or "=" in cmd_list[0]
+        or cmd_list[0] in SHELL_BUILTINS
+    )
+
 @mcp.tool()
 def execute(command: str, cwd: str = ".") -> str:
     """
@@ -256,16 +351,28 @@ def execute(command: str, cwd: str = ".") -> str:
     """
     try:
         working_dir = _resolve_path(cwd)
-        cmd_list = command.split() # Simple split
+        # Same tokens for the permission check and, for plain commands, for exec
+        try:
+            cmd_list = shlex.split(command)
+            tokenized = True
+        except ValueError:
+            # sh accepts things shlex can't (heredocs, apostrophes in
+            # comments...); check whitespace tokens and hand it to the shell
+            cmd_list = command.split()
+            tokenized = False
+        if not cmd_list:
+            return "Error: Empty command"
         
         _check_perm("exec", command=cmd_list)
         
-        if "sudo" in cmd_list and not ALLOW_SUDO:
+        # Any token, not just argv[0]: shell commands can chain into sudo
+        if not ALLOW_SUDO and not SUDO_BINS.isdisjoint(cmd_list):
              return "Error: sudo not allowed by configuration"
 
+        needs_shell = not tokenized or _needs_shell(command, cmd_list)
         result = subprocess.run(
-            command,
-            shell=True, 
+            command if needs_shell else cmd_list,
+            shell=needs_shell,
             cwd=str(working_dir),
             text=True,
             stdout=subprocess.PIPE,
@@ -273,6 +380,9 @@ def execute(command: str, cwd: str = ".") -> str:
             timeout=300
         )
         
+        # Arbitrary commands can move, link or delete anything
+        _resolve_cached.cache_clear()
+        
         output = f"STDOUT:\n{result.stdout}\n"
         if result.stderr:
             output += f"\nSTDERR:\n{result.stderr}"
@@ -1,27 +1,242 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import json
 import os
+import queue
 import re
+import sys
+import threading
 import time
+from collections import Counter, OrderedDict, deque
 from pathlib import Path
 import heapq
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import mmap
+from array import array
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 MEMORY_DIR = Path(os.getenv("TRAPDOOR_MEMORY_DIR", Path(__file__).resolve().parent))
 EVENTS_PATH = MEMORY_DIR / "events.jsonl"
 LESSONS_PATH = MEMORY_DIR / "lessons.jsonl"
+# Workflow payloads are also written here so workflow queries don't have to
+# scan (and discard) every other event kind. It is derived data: events.jsonl
+# stays the source of truth, and deleting this file makes the next workflow
+# read or write rebuild it from there.
+WORKFLOWS_PATH = MEMORY_DIR / "workflows.jsonl"
+
+TAIL_CACHE_SIZE = 512
+TAIL_BLOCK = 8192
+
+# Appends are queued and written by a background thread, one write() per file
+# per batch. TRAPDOOR_SYNC_WRITES=1 writes inline instead.
+SYNC_WRITES = os.getenv("TRAPDOOR_SYNC_WRITES") == "1"
+FSYNC_WRITES = os.getenv("TRAPDOOR_FSYNC_WRITES") == "1"
+WRITE_BATCH_MAX = 4096
+WRITE_BATCH_BYTES = 1 << 20
+# Readers wait at most this long for queued appends before reading anyway
+READ_FLUSH_TIMEOUT = 10.0
+
+
+class _TailCache:
+    """Last decoded records of a file, valid while the file is `size` bytes."""
+
+    __slots__ = ("size", "complete", "records")
+
+    def __init__(self, size: int, complete: bool, records: Iterable[Dict[str, Any]]) -> None:
+        self.size = size
+        self.complete = complete
+        self.records: Deque[Dict[str, Any]] = deque(records, maxlen=TAIL_CACHE_SIZE)
+
+
+_tail_cache: Dict[Path, _TailCache] = {}
+_cache_lock = threading.Lock()
+
+# Full-file readers share one bounded cache of raw lines keyed by
+# (st_mtime_ns, st_size); any write changes the key and forces a re-read.
+JSONL_CACHE_BYTES = 64 << 20
+_jsonl_cache: "OrderedDict[Path, Tuple[Tuple[int, int], List[bytes]]]" = OrderedDict()
+_jsonl_cache_bytes = 0
 
 
 def _ensure_dir() -> None:
     MEMORY_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _extend_tail_cache(path: Path, start: int, end: int, records: Sequence[Dict[str, Any]]) -> None:
+    with _cache_lock:
+        cache = _tail_cache.get(path)
+        if cache is None:
+            return
+        if cache.size != start:
+            # Someone else appended in between; re-read on next query.
+            del _tail_cache[path]
+            return
+        if len(cache.records) + len(records) > TAIL_CACHE_SIZE:
+            cache.complete = False
+        cache.records.extend(records)
+        cache.size = end
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class _JsonlWriter:
+    """Background appender that coalesces queued records into one write per file."""
+
+    def __init__(self) -> None:
+        self._queue: "queue.SimpleQueue[Tuple[Optional[Path], Any, Any]]" = queue.SimpleQueue()
+        self._fds: Dict[Path, int] = {}
+        self._unwritten = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None  # last failed write, raised by flush()
+
+    def submit(self, path: Path, line: bytes, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._unwritten += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((path, line, record))
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until everything submitted so far has been written (or timeout)."""
+        if not self._unwritten or self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put((None, done, None))
+        done.wait(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Like wait(), then raise the last write error, if any, once."""
+        self.wait(timeout)
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._drain(self._queue.get())
+            except Exception as e:  # keep the thread alive; readers wait on it
+                self._error = e
+                print(f"jsonl-writer: {e!r}", file=sys.stderr)
+
+    def _drain(self, first: Tuple[Optional[Path], Any, Any]) -> None:
+        pending: Dict[Path, Tuple[bytearray, List[Dict[str, Any]]]] = {}
+        waiters: List[threading.Event] = []
+        item: Optional[Tuple[Optional[Path], Any, Any]] = first
+        count = size = 0
+        while item is not None:
+            path, line, record = item
+            if path is None:
+                waiters.append(line)
+            else:
+                buf, records = pending.setdefault(path, (bytearray(), []))
+                buf += line
+                records.append(record)
+                count += 1
+                size += len(line)
+            if count >= WRITE_BATCH_MAX or size >= WRITE_BATCH_BYTES:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                item = None
+
+        try:
+            for path, (buf, records) in pending.items():
+                try:
+                    self._write(path, bytes(buf), records)
+                except OSError as e:
+                    self._error = e
+                    print(f"jsonl-writer: dropped {len(records)} records for {path}: {e}", file=sys.stderr)
+        except Exception as e:
+            # Recorded before the waiters below are released, so their flush() sees it
+            self._error = e
+            print(f"jsonl-writer: {e!r}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self._unwritten -= count
+            for done in waiters:
+                done.set()
+
+    def _handle(self, path: Path) -> int:
+        fd = self._fds.get(path)
+        if fd is not None:
+            try:
+                if os.fstat(fd).st_ino == path.stat().st_ino:
+                    return fd
+            except OSError:
+                pass
+            os.close(fd)  # file was rotated or removed; reopen it
+        _ensure_dir()
+        fd = self._fds[path] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return fd
+
+    def _write(self, path: Path, data: bytes, records: Sequence[Dict[str, Any]]) -> None:
+        fd = self._handle(path)
+        _write_all(fd, data)
+        if FSYNC_WRITES:
+            os.fsync(fd)
+        end = os.lseek(fd, 0, os.SEEK_CUR)
+        _extend_tail_cache(path, end - len(data), end, records)
+
+
+_writer = _JsonlWriter()
+atexit.register(_writer.wait, 5.0)
+
+
+def flush() -> None:
+    """Wait for queued appends to reach disk; raises the last write error, if any."""
+    _writer.flush()
+
+
 def _append(path: Path, record: Dict[str, Any]) -> None:
+    _append_many(path, [record])
+
+
+def _append_many(path: Path, records: Sequence[Dict[str, Any]]) -> None:
+    """Append records in order via the writer (or inline when SYNC_WRITES)."""
+    lines = [_dumps_line(record) for record in records]
+    if not SYNC_WRITES:
+        for line, record in zip(lines, records):
+            _writer.submit(path, line, record)
+        return
+    data = b"".join(lines)
+    if not data:
+        return
     _ensure_dir()
-    with path.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        _write_all(fd, data)
+        if FSYNC_WRITES:
+            os.fsync(fd)
+        end = os.lseek(fd, 0, os.SEEK_CUR)
+    finally:
+        os.close(fd)
+    _extend_tail_cache(path, end - len(data), end, records)
 
 
 def record_event(kind: str, data: Dict[str, Any]) -> None:
@@ -33,6 +248,11 @@ def record_event(kind: str, data: Dict[str, Any]) -> None:
     _append(EVENTS_PATH, event)
 
 
+def record_events(events: Iterable[Tuple[float, str, Dict[str, Any]]]) -> None:
+    """Append several (ts, kind, data) events, in order with record_event() calls."""
+    _append_many(EVENTS_PATH, [{"ts": ts, "kind": kind, "data": data} for ts, kind, data in events])
+
+
 def add_lesson(title: str, summary: str, *, tags: Optional[List[str]] = None) -> None:
     lesson = {
         "ts": time.time(),
@@ -43,81 +263,248 @@ def add_lesson(title: str, summary: str, *, tags: Optional[List[str]] = None) ->
     _append(LESSONS_PATH, lesson)
 
 
+def _mmap_lines(path: Path) -> Iterator[bytes]:
+    """Split a file on newlines with mmap.find (memchr) instead of line iteration."""
+    with path.open("rb") as fh:
+        try:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with buf:
+            pos, size = 0, len(buf)
+            while pos < size:
+                nl = buf.find(b"\n", pos)
+                if nl < 0:
+                    nl = size
+                yield buf[pos:nl]
+                pos = nl + 1
+
+
+def _iter_jsonl_raw(path: Path) -> Iterator[bytes]:
+    """Yield the non-blank lines of a JSONL file as undecoded bytes."""
+    _writer.wait(READ_FLUSH_TIMEOUT)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return
+    yield from _raw_lines(path, (st.st_mtime_ns, st.st_size))
+
+
+def _raw_lines(path: Path, key: Tuple[int, int]) -> Iterable[bytes]:
+    """Non-blank lines of path, served from memory while (mtime, size) is unchanged."""
+    global _jsonl_cache_bytes
+    with _cache_lock:
+        hit = _jsonl_cache.get(path)
+        if hit is not None and hit[0] == key:
+            _jsonl_cache.move_to_end(path)
+            return hit[1]
+    stripped = (line.strip() for line in _mmap_lines(path))
+    if key[1] > JSONL_CACHE_BYTES:
+        return (line for line in stripped if line)
+    lines = [line for line in stripped if line]
+    with _cache_lock:
+        old = _jsonl_cache.pop(path, None)
+        if old is not None:
+            _jsonl_cache_bytes -= old[0][1]
+        _jsonl_cache[path] = (key, lines)
+        _jsonl_cache_bytes += key[1]
+        while _jsonl_cache_bytes > JSONL_CACHE_BYTES:
+            _, ((_, size), _) = _jsonl_cache.popitem(last=False)
+            _jsonl_cache_bytes -= size
+    return lines
+
+
+def _decode(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        try:
+            yield _loads(line)
+        except ValueError:  # JSONDecodeError or invalid UTF-8
+            continue
+
+
 def _load_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
-    if not path.exists():
+    return _decode(_iter_jsonl_raw(path))
+
+
+def _decode_lines(blob: bytes) -> List[Dict[str, Any]]:
+    return list(_decode(line for line in blob.splitlines() if line.strip()))
+
+
+def _tail(path: Path, n: int) -> List[Dict[str, Any]]:
+    """Return the last `n` records of a JSONL file without parsing the rest."""
+    if n <= 0:
+        return list(_load_jsonl(path))[-n:]  # same slice semantics as before
+    _writer.wait(READ_FLUSH_TIMEOUT)
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
         return []
-    with path.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    with _cache_lock:
+        cache = _tail_cache.get(path)
+        if cache is not None and cache.size == size and (cache.complete or n <= len(cache.records)):
+            return list(cache.records)[-n:]
+
+    records, size, complete = _tail_records(path, n)
+    with _cache_lock:
+        _tail_cache[path] = _TailCache(size, complete and len(records) <= TAIL_CACHE_SIZE, records)
+    return records[-n:]
+
+
+def _tail_records(path: Path, n: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Read backwards from EOF in blocks until `n` records decode.
+
+    Returns (records, file size read, whether the whole file was covered).
+    """
+    records: List[Dict[str, Any]] = []
+    head = b""  # partial first line of the block read so far
+    with path.open("rb") as fh:
+        pos = size = fh.seek(0, os.SEEK_END)
+        while pos > 0 and len(records) < n:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            fh.seek(pos)
+            lines = (fh.read(step) + head).split(b"\n")
+            head = lines.pop(0) if pos > 0 else b""
+            records[:0] = _decode(line for line in lines if line.strip())
+    return records, size, pos == 0
 
 
 def get_recent_events(limit: int = 10) -> List[Dict[str, Any]]:
-    events = list(_load_jsonl(EVENTS_PATH))
-    return events[-limit:]
+    return _tail(EVENTS_PATH, limit)
 
 
 def get_recent_lessons(limit: int = 10) -> List[Dict[str, Any]]:
-    lessons = list(_load_jsonl(LESSONS_PATH))
-    return lessons[-limit:]
+    return _tail(LESSONS_PATH, limit)
 
 
-def search_events(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    pattern = re.compile(re.escape(query), re.IGNORECASE)
+@functools.lru_cache(maxsize=256)
+def _compiled_query(query: str) -> re.Pattern:
+    return re.compile(re.escape(query), re.IGNORECASE)
+
+
+def _search(path: Path, query: str, limit: int) -> List[Dict[str, Any]]:
+    # Match against the line as stored and only decode the hits. The query is
+    # a literal, so ASCII queries against ASCII lines are a plain substring
+    # test; anything else goes through the regex for Unicode case folding.
+    pattern = _compiled_query(query)
+    needle = query.lower().encode("ascii") if query.isascii() else None
+
+    def hit(line: bytes) -> bool:
+        if needle is not None and line.isascii():
+            return needle in line.lower()
+        return pattern.search(line.decode("utf-8", "replace")) is not None
+
     matches: List[Dict[str, Any]] = []
-    for event in _load_jsonl(EVENTS_PATH):
-        payload = json.dumps(event, ensure_ascii=False)
-        if pattern.search(payload):
-            matches.append(event)
-            if len(matches) >= limit:
-                break
+    for record in _decode(line for line in _iter_jsonl_raw(path) if hit(line)):
+        matches.append(record)
+        if len(matches) >= limit:
+            break
     return matches
 
 
+def search_events(query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    return _search(EVENTS_PATH, query, limit)
+
+
 def search_lessons(query: str, limit: int = 5) -> List[Dict[str, Any]]:
-    pattern = re.compile(re.escape(query), re.IGNORECASE)
-    matches: List[Dict[str, Any]] = []
-    for lesson in _load_jsonl(LESSONS_PATH):
-        payload = json.dumps(lesson, ensure_ascii=False)
-        if pattern.search(payload):
-            matches.append(lesson)
-            if len(matches) >= limit:
-                break
-    return matches
+    return _search(LESSONS_PATH, query, limit)
 
 
 def describe_recent_activity(limit: int = 20) -> Dict[str, Any]:
     events = get_recent_events(limit)
     lessons = get_recent_lessons(limit)
-    stats = {"total_events": len(events), "kinds": {}}
-    for event in events:
-        stats["kinds"][event.get("kind")] = stats["kinds"].get(event.get("kind"), 0) + 1
+    stats = {"total_events": len(events), "kinds": dict(Counter(event.get("kind") for event in events))}
     return {"events": events, "lessons": lessons, "stats": stats}
 
 
-def _keyword_set(text: str) -> set[str]:
-    tokens = re.findall(r"[a-z0-9_]+", text.lower())
-    return {tok for tok in tokens if len(tok) > 2}
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def _keyword_set(text: str) -> frozenset[str]:
+    return frozenset(tok for tok in _TOKEN_RE.findall(text.lower()) if len(tok) > 2)
+
+
+class _KeywordIndex:
+    """Records of one file plus an inverted index from keyword to record positions.
+
+    Memory is O(total keywords across records); scoring a query only touches
+    the postings of its own keywords.
+    """
+
+    __slots__ = ("records", "sizes", "postings")
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self.sizes = array("I")  # distinct keywords per record
+        self.postings: Dict[str, array] = {}
+
+    def add(self, keywords: Iterable[str], record: Dict[str, Any]) -> None:
+        pos = len(self.records)
+        count = 0
+        for tok in keywords:
+            plist = self.postings.get(tok)
+            if plist is None:
+                plist = self.postings[tok] = array("I")
+            plist.append(pos)
+            count += 1
+        self.records.append(record)
+        self.sizes.append(count)
+
+    def overlap(self, keywords: Iterable[str]) -> Counter:
+        """Map record position -> how many of `keywords` it holds (zero overlaps omitted)."""
+        counts: Counter = Counter()
+        for tok in keywords:
+            plist = self.postings.get(tok)
+            if plist is not None:
+                counts.update(plist)
+        return counts
+
+
+_LESSON_CACHE: Dict[Path, Tuple[Tuple[int, int], _KeywordIndex]] = {}
+_WF_CACHE: Dict[Path, Tuple[Tuple[int, int], _KeywordIndex]] = {}
+
+
+def _stat_cached(cache: Dict[Path, Tuple[Tuple[int, int], _KeywordIndex]], path: Path, build) -> _KeywordIndex:
+    """Return build(path), rebuilt only when the file's mtime or size changes."""
+    _writer.wait(READ_FLUSH_TIMEOUT)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return _KeywordIndex()
+    key = (st.st_mtime_ns, st.st_size)
+    hit = cache.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    index = build(path)
+    cache[path] = (key, index)
+    return index
+
+
+def _build_lesson_index(path: Path) -> _KeywordIndex:
+    index = _KeywordIndex()
+    for lesson in _load_jsonl(path):
+        lesson_text = f"{lesson.get('title','')} {lesson.get('summary','')} {' '.join(lesson.get('tags') or [])}"
+        index.add(_keyword_set(lesson_text), lesson)
+    return index
 
 
 def get_relevant_lessons(query: str, *, tags: Optional[Sequence[str]] = None, limit: int = 3) -> List[Dict[str, Any]]:
-    lessons = list(_load_jsonl(LESSONS_PATH))
+    index = _stat_cached(_LESSON_CACHE, LESSONS_PATH, _build_lesson_index)
+    lessons = index.records
     if not lessons:
         return []
     query_keys = _keyword_set(query)
     if tags:
-        query_keys.update(t.lower() for t in tags if t)
+        query_keys = query_keys.union(t.lower() for t in tags if t)
+    overlap = index.overlap(query_keys)
 
+    # Without a tag bonus or an empty query, only lessons sharing a keyword can score
+    candidates = range(len(lessons)) if tags or not query_keys else sorted(overlap)
     scored: List[Tuple[int, float, Dict[str, Any]]] = []
-    for lesson in lessons:
-        lesson_text = f"{lesson.get('title','')} {lesson.get('summary','')} {' '.join(lesson.get('tags') or [])}"
-        lesson_keys = _keyword_set(lesson_text)
-        score = len(query_keys & lesson_keys)
+    for pos in candidates:
+        lesson = lessons[pos]
+        score = overlap.get(pos, 0)
         if tags and set(lesson.get("tags") or []) & set(tags):
             score += 2
         if score == 0 and query_keys:
@@ -175,94 +562,165 @@ def record_workflow_event(
         "step_count": len(steps),
         "tags": tags or _extract_workflow_tags(intent, steps)
     }
+    _ensure_workflow_log()
     _append(EVENTS_PATH, {"kind": "workflow", "data": workflow})
+    _append(WORKFLOWS_PATH, workflow)
+
+
+_workflow_log_lock = threading.Lock()
+
+
+def _ensure_workflow_log() -> None:
+    """Seed workflows.jsonl from the unified event log the first time it's needed.
+
+    Several processes import this module, so the seed is published with
+    os.link, which fails rather than replacing a log another process has
+    already seeded (and possibly appended to).
+    """
+    if WORKFLOWS_PATH.exists():
+        return
+    with _workflow_log_lock:
+        if WORKFLOWS_PATH.exists():
+            return
+        lines = b"".join(
+            _dumps_line(e["data"]) for e in _load_jsonl(EVENTS_PATH) if e.get("kind") == "workflow"
+        )
+        _ensure_dir()
+        tmp = WORKFLOWS_PATH.with_name(f"{WORKFLOWS_PATH.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(lines)
+            try:
+                os.link(tmp, WORKFLOWS_PATH)
+            except FileExistsError:
+                pass  # another process seeded it first
+            except OSError:
+                # No hard links on this filesystem; exclusive create is the
+                # next best thing (readers may briefly see a partial seed)
+                try:
+                    fd = os.open(WORKFLOWS_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                except FileExistsError:
+                    return
+                try:
+                    _write_all(fd, lines)
+                finally:
+                    os.close(fd)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+
+# Keyword -> tag tables for _extract_workflow_tags. The lookahead makes each
+# regex report overlapping hits ("gitest" yields both git and test) in one pass.
+_STEP_TAGS = {
+    "git": "git", "npm": "nodejs", "package.json": "nodejs", "test": "testing",
+    "python": "python", ".py": "python", "docker": "docker",
+}
+_INTENT_TAGS = {
+    "deploy": "deployment", "release": "deployment", "publish": "deployment",
+    "check": "status_check", "status": "status_check", "verify": "status_check",
+}
+_TAG_ORDER = ["git", "nodejs", "testing", "python", "docker", "deployment", "status_check"]
+_STEP_TAG_RE = re.compile("(?=(%s))" % "|".join(map(re.escape, _STEP_TAGS)))
+_INTENT_TAG_RE = re.compile("(?=(%s))" % "|".join(map(re.escape, _INTENT_TAGS)))
+
+
+def _step_text(step: Dict[str, Any]) -> str:
+    cmd = step.get("cmd", "")
+    cmd_text = " ".join(map(str, cmd)) if isinstance(cmd, list) else str(cmd)
+    return f"{step.get('operation', '')} {step.get('path', '')} {cmd_text}"
 
 
 def _extract_workflow_tags(intent: str, steps: List[Dict]) -> List[str]:
     """Auto-tag workflows based on content"""
-    tags = []
-    intent_lower = intent.lower()
-    steps_str = str(steps).lower()
-
-    # Detect patterns in steps
-    if "git" in steps_str:
-        tags.append("git")
-    if "npm" in steps_str or "package.json" in steps_str:
-        tags.append("nodejs")
-    if "test" in steps_str:
-        tags.append("testing")
-    if "python" in steps_str or ".py" in steps_str:
-        tags.append("python")
-    if "docker" in steps_str:
-        tags.append("docker")
-
-    # Detect patterns in intent
-    if any(word in intent_lower for word in ["deploy", "release", "publish"]):
-        tags.append("deployment")
-    if any(word in intent_lower for word in ["check", "status", "verify"]):
-        tags.append("status_check")
-
-    return tags
+    # Only the operation/path/cmd of each step is scanned, not a repr of the
+    # whole step list
+    haystack = " ".join(_step_text(step) for step in steps).lower()
+    found = {_STEP_TAGS[m.group(1)] for m in _STEP_TAG_RE.finditer(haystack)}
+    found.update(_INTENT_TAGS[m.group(1)] for m in _INTENT_TAG_RE.finditer(intent.lower()))
+    return [tag for tag in _TAG_ORDER if tag in found]
+
+
+def _build_workflow_index(path: Path) -> _KeywordIndex:
+    index = _KeywordIndex()
+    for wf in _load_jsonl(path):
+        index.add(set(wf["intent"].lower().split()), wf)
+    return index
 
 
 def find_similar_workflows(intent: str, limit: int = 5, min_success_rate: float = 0.5) -> List[Dict]:
     """Find workflows similar to current intent"""
-    workflows = [
-        e["data"] for e in _load_jsonl(EVENTS_PATH)
-        if e.get("kind") == "workflow"
-    ]
+    _ensure_workflow_log()
+    index = _stat_cached(_WF_CACHE, WORKFLOWS_PATH, _build_workflow_index)
 
-    if not workflows:
+    if not index.records:
         return []
 
-    # Score by intent similarity and success
-    scored = []
+    # Score by intent similarity and success, keeping only the top `limit`
+    # in a min-heap of (score, -position, wf); -position keeps earlier
+    # workflows ahead on ties, and never lets the dicts get compared
+    heap: List[Tuple[float, int, Dict[str, Any]]] = []
     intent_tokens = set(intent.lower().split())
+    if not intent_tokens or limit <= 0:
+        return []
 
-    for wf in workflows:
-        wf_tokens = set(wf["intent"].lower().split())
-        if not intent_tokens or not wf_tokens:
-            continue
+    # Workflows sharing no token score 0 and could never pass the cutoff below
+    for pos, inter in index.overlap(intent_tokens).items():
+        wf = index.records[pos]
 
-        similarity = len(intent_tokens & wf_tokens) / len(intent_tokens | wf_tokens)
+        # |A ∪ B| = |A| + |B| - |A ∩ B|
+        similarity = inter / (len(intent_tokens) + index.sizes[pos] - inter)
 
         # Boost successful workflows
         score = similarity * (1.5 if wf["success"] else 0.5)
 
-        scored.append((score, wf))
+        if len(heap) < limit:
+            heapq.heappush(heap, (score, -pos, wf))
+        elif (score, -pos) > heap[0][:2]:
+            heapq.heapreplace(heap, (score, -pos, wf))
 
-    # Sort and filter
-    scored.sort(reverse=True, key=lambda x: x[0])
-    return [wf for score, wf in scored[:limit] if score > 0.1]
+    heap.sort(key=lambda item: item[:2], reverse=True)
+    return [wf for score, _, wf in heap if score > 0.1]
 
 
 def get_workflow_stats(intent: str = None) -> Dict[str, Any]:
     """Get statistics about workflow executions"""
-    workflows = [
-        e["data"] for e in _load_jsonl(EVENTS_PATH)
-        if e.get("kind") == "workflow"
-    ]
-
-    if not workflows:
+    _ensure_workflow_log()
+    intent_lower = intent.lower() if intent else None
+    # Raw-line pre-filter: an ASCII line can only hold the intent if it holds
+    # the needle verbatim (provided the needle needs no JSON escaping)
+    needle = None
+    if intent_lower and intent_lower.isascii() and intent_lower.isprintable() and not any(c in intent_lower for c in '"\\'):
+        needle = intent_lower.encode()
+
+    seen = total = successful = durations = 0
+    duration_sum = 0.0
+    for line in _iter_jsonl_raw(WORKFLOWS_PATH):
+        if needle is not None and line.isascii() and needle not in line.lower():
+            seen += 1
+            continue
+        try:
+            w = _loads(line)
+        except ValueError:
+            continue
+        seen += 1
+        # Filter by intent if provided
+        if intent_lower and intent_lower not in w["intent"].lower():
+            continue
+        total += 1
+        if w["success"]:
+            successful += 1
+        if w.get("duration"):
+            duration_sum += w["duration"]
+            durations += 1
+
+    if not seen:
         return {"total": 0, "successful": 0, "failed": 0, "avg_duration": 0}
 
-    # Filter by intent if provided
-    if intent:
-        intent_lower = intent.lower()
-        workflows = [w for w in workflows if intent_lower in w["intent"].lower()]
-
-    total = len(workflows)
-    successful = sum(1 for w in workflows if w["success"])
-    failed = total - successful
-    durations = [w["duration"] for w in workflows if w.get("duration")]
-    avg_duration = sum(durations) / len(durations) if durations else 0
-
     return {
         "total": total,
         "successful": successful,
-        "failed": failed,
+        "failed": total - successful,
         "success_rate": successful / total if total > 0 else 0,
-        "avg_duration": avg_duration
+        "avg_duration": duration_sum / durations if durations else 0
     }
 
 
@@ -3,9 +3,11 @@
 Analyze workflow patterns and suggest optimizations
 """
 from __future__ import annotations
+import json
+import os
 import sys
 from pathlib import Path
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
 
 # Add parent directory to path to import store
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -13,38 +15,142 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from memory import store
 
 
+COMMAND_KINDS = {"fs_read", "fs_ls", "exec", "fs_write"}
+
+
+def _get_ts(event):
+    # Extract timestamps safely (events have different structures)
+    return event.get("ts") or event.get("data", {}).get("ts", 0)
+
+
+def _aggregate(path: Path) -> dict:
+    """One streaming pass over the event log, collecting every report's counters."""
+    total = 0
+    first_ts = last_ts = 0
+    event_types = Counter()
+    seq_counts = Counter()
+    path_counts = Counter()
+    cmd_counts = Counter()
+    read_counts = Counter()
+    chat_count = 0
+    recent_chats = deque(maxlen=5)
+    window = deque(maxlen=3)
+    commands_seen = 0
+
+    for e in store._load_jsonl(path):
+        if not total:
+            first_ts = _get_ts(e)
+        last_ts = _get_ts(e)
+        total += 1
+
+        kind = e.get("kind")
+        data = e.get("data", {})
+        event_types[kind] += 1
+
+        if kind in COMMAND_KINDS:
+            window.append(kind)
+            commands_seen += 1
+            if commands_seen >= 2:
+                seq_counts[tuple(window)] += 1  # last 3 commands
+        if "path" in data:
+            path_counts[data["path"]] += 1
+        if kind == "exec":
+            cmd = data.get("cmd", [])
+            if cmd:
+                cmd_counts[cmd[0] if isinstance(cmd, list) else str(cmd)] += 1
+        elif kind == "fs_read":
+            if data.get("path"):
+                read_counts[data["path"]] += 1
+        elif kind == "chat_completion":
+            chat_count += 1
+            recent_chats.append(data.get("summary", "")[:60])
+
+    return {
+        "total": total,
+        "first_ts": first_ts,
+        "last_ts": last_ts,
+        "event_types": event_types,
+        "seq_counts": seq_counts,
+        "path_counts": path_counts,
+        "cmd_counts": cmd_counts,
+        "read_counts": read_counts,
+        "chat_count": chat_count,
+        "recent_chats": list(recent_chats),
+    }
+
+
+_COUNTERS = ("event_types", "seq_counts", "path_counts", "cmd_counts", "read_counts")
+
+
+def _encode_stats(key: tuple, stats: dict) -> str:
+    # Counters become [key, count] pairs so non-string keys and insertion
+    # order (most_common tie-breaking) survive the round trip
+    doc = {name: value for name, value in stats.items() if name not in _COUNTERS}
+    for name in _COUNTERS:
+        doc[name] = [[list(k) if name == "seq_counts" else k, n] for k, n in stats[name].items()]
+    return json.dumps({"key": list(key), "stats": doc})
+
+
+def _decode_stats(text: str) -> tuple:
+    doc = json.loads(text)
+    try:
+        stats = dict(doc["stats"])
+        for name in _COUNTERS:
+            stats[name] = Counter({
+                (tuple(k) if name == "seq_counts" else k): n for k, n in stats[name]
+            })
+        return tuple(doc["key"]), stats
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"malformed analyze cache: {e}") from e
+
+
+def _load_aggregate(path: Path) -> dict:
+    """Aggregate the log, reusing the cached JSON result while the file is unchanged."""
+    store.flush()
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return _aggregate(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cache_path = path.with_name(path.name + ".analyze.cache")
+    try:
+        cached_key, stats = _decode_stats(cache_path.read_text(encoding="utf-8"))
+        if cached_key == key:
+            return stats
+    except (OSError, ValueError):
+        pass
+    stats = _aggregate(path)
+    try:
+        tmp = cache_path.with_name(cache_path.name + ".tmp")
+        tmp.write_text(_encode_stats(key, stats), encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass
+    return stats
+
+
 def analyze_workflows():
     """Generate workflow analytics"""
 
-    # Load all events (we'll identify workflows from sequences)
-    events = list(store._load_jsonl(store.EVENTS_PATH))
+    stats = _load_aggregate(store.EVENTS_PATH)
+    total = stats["total"]
 
-    if not events:
+    if not total:
         print("No events found in memory system yet.")
         return
 
-    print(f"=== Total Events: {len(events)} ===\n")
+    print(f"=== Total Events: {total} ===\n")
 
     # 1. Event type distribution
-    event_types = Counter(e.get("kind") for e in events)
     print("=== Event Type Distribution ===")
-    for kind, count in event_types.most_common():
+    for kind, count in stats["event_types"].most_common():
         print(f"{count:3d}x {kind}")
 
     # 2. Identify command sequences (potential workflows)
     print("\n=== Common Command Sequences ===")
-    sequences = []
-    current_seq = []
-
-    for e in events:
-        kind = e.get("kind")
-        if kind in ["fs_read", "fs_ls", "exec", "fs_write"]:
-            current_seq.append(kind)
-            if len(current_seq) >= 2:
-                sequences.append(tuple(current_seq[-3:]))  # Last 3 commands
+    seq_counts = stats["seq_counts"]
 
-    if sequences:
-        seq_counts = Counter(sequences)
+    if seq_counts:
         for seq, count in seq_counts.most_common(10):
             if count > 1:  # Only show repeated patterns
                 print(f"{count:3d}x {' → '.join(seq)}")
@@ -53,14 +159,9 @@ def analyze_workflows():
 
     # 3. Most accessed paths
     print("\n=== Most Accessed Paths ===")
-    paths = []
-    for e in events:
-        data = e.get("data", {})
-        if "path" in data:
-            paths.append(data["path"])
+    path_counts = stats["path_counts"]
 
-    if paths:
-        path_counts = Counter(paths)
+    if path_counts:
         for path, count in path_counts.most_common(10):
             print(f"{count:3d}x {path}")
     else:
@@ -68,38 +169,28 @@ def analyze_workflows():
 
     # 4. Command execution patterns
     print("\n=== Command Execution Patterns ===")
-    commands = []
-    for e in events:
-        if e.get("kind") == "exec":
-            cmd = e.get("data", {}).get("cmd", [])
-            if cmd:
-                commands.append(cmd[0] if isinstance(cmd, list) else str(cmd))
+    cmd_counts = stats["cmd_counts"]
 
-    if commands:
-        cmd_counts = Counter(commands)
+    if cmd_counts:
         for cmd, count in cmd_counts.most_common(10):
             print(f"{count:3d}x {cmd}")
     else:
         print("No command execution patterns yet.")
 
     # 5. Chat completion frequency
-    chat_events = [e for e in events if e.get("kind") == "chat_completion"]
-    print(f"\n=== Chat Completions: {len(chat_events)} ===")
+    print(f"\n=== Chat Completions: {stats['chat_count']} ===")
 
-    if chat_events:
+    if stats["chat_count"]:
         # Show recent chat summaries
         print("\nRecent chats:")
-        for e in chat_events[-5:]:
-            summary = e.get("data", {}).get("summary", "")[:60]
+        for summary in stats["recent_chats"]:
             print(f"  - {summary}")
 
     # 6. Automation candidates
     print("\n=== Potential Automation Candidates ===")
 
     # Find repeated fs_read operations
-    read_paths = [e.get("data", {}).get("path") for e in events
-                  if e.get("kind") == "fs_read"]
-    read_counts = Counter(p for p in read_paths if p)
+    read_counts = stats["read_counts"]
 
     if read_counts:
         print("\nFrequently read files:")
@@ -109,7 +200,7 @@ def analyze_workflows():
                 print(f"      → Could cache or auto-include in context")
 
     # Find repeated command sequences
-    if sequences:
+    if seq_counts:
         print("\nRepeated command sequences:")
         for seq, count in seq_counts.most_common(5):
             if count >= 3:
@@ -118,20 +209,14 @@ def analyze_workflows():
 
     # 7. Time analysis
     print("\n=== Activity Timeline ===")
-    if events:
-        # Extract timestamps safely (events have different structures)
-        def get_ts(event):
-            return event.get("ts") or event.get("data", {}).get("ts", 0)
-
-        first_ts = get_ts(events[0])
-        last_ts = get_ts(events[-1])
-
-        if first_ts and last_ts and last_ts > first_ts:
-            duration_hours = (last_ts - first_ts) / 3600
-            print(f"Time span: {duration_hours:.1f} hours")
-            print(f"Events per hour: {len(events) / duration_hours:.1f}")
-        else:
-            print("Insufficient timestamp data for timeline analysis")
+    first_ts, last_ts = stats["first_ts"], stats["last_ts"]
+
+    if first_ts and last_ts and last_ts > first_ts:
+        duration_hours = (last_ts - first_ts) / 3600
+        print(f"Time span: {duration_hours:.1f} hours")
+        print(f"Events per hour: {total / duration_hours:.1f}")
+    else:
+        print("Insufficient timestamp data for timeline analysis")
 
     print("\n" + "="*50)
     print("Analysis complete!")
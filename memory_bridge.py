@@ -12,9 +12,18 @@ Requires Qdrant running at localhost:6333 (Docker container)
 
 import os
 import json
+import asyncio
+import functools
 import hashlib
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from pathlib import Path
+from typing import Optional, Iterator, List, Dict, Any
 from dataclasses import dataclass, asdict
 
 # Try to import qdrant, fall back gracefully
@@ -29,6 +38,17 @@ except ImportError:
     QDRANT_AVAILABLE = False
     QdrantClient = None
 
+# Server-side int8 scalar quantization (qdrant-client >= 1.1)
+try:
+    from qdrant_client.http.models import (
+        ScalarQuantization, ScalarQuantizationConfig, ScalarType
+    )
+    QUANTIZATION_CONFIG = ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+    )
+except ImportError:
+    QUANTIZATION_CONFIG = None
+
 # Try to import embedding providers
 try:
     import openai
@@ -42,6 +62,21 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# FastAPI/Pydantic are only needed for create_memory_router()
+try:
+    from fastapi import APIRouter, HTTPException
+    from fastapi.responses import ORJSONResponse, StreamingResponse
+    from pydantic import BaseModel, Field
+    FASTAPI_AVAILABLE = True
+except ImportError:
+    FASTAPI_AVAILABLE = False
+
 
 # ==============================================================================
 # Configuration
@@ -97,46 +132,209 @@ class SearchResult:
 # Embedding Generation
 # ==============================================================================
 
-def get_embedding(text: str) -> Optional[List[float]]:
+OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
+OLLAMA_EMBEDDING_MODEL = "nomic-embed-text"
+EMBEDDING_CACHE_PATH = Path(os.getenv(
+    "TRAPDOOR_EMBEDDING_CACHE",
+    Path.home() / ".cache" / "trapdoor" / "embeddings.sqlite"
+))
+EMBEDDING_MEMO_SIZE = 1024  # in-process hits that skip sqlite entirely
+
+
+def _pack_vector(vector: List[float]) -> bytes:
+    """Pack as little-endian float16: half the size of float32, plenty for cosine."""
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def _unpack_vector(blob: bytes) -> List[float]:
+    return list(struct.unpack(f"<{len(blob) // 2}e", blob))
+
+
+class EmbeddingCache:
     """
-    Generate embedding for text using available providers.
+    Persistent embedding cache keyed by sha256(model + text).
 
-    Priority:
-    1. OpenAI API (if OPENAI_API_KEY set)
-    2. Local Ollama (if running)
-    3. None (fall back to keyword search)
+    Vectors are stored as packed float16 blobs in sqlite, with a small
+    in-process LRU of the same blobs in front. Any sqlite error disables
+    the disk layer rather than failing the embedding call.
     """
-    # Try OpenAI
-    if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
+
+    def __init__(self, path: Path = EMBEDDING_CACHE_PATH, memo_size: int = EMBEDDING_MEMO_SIZE):
+        self.path = path
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                conn.execute("CREATE TABLE IF NOT EXISTS embeddings_f16 (key BLOB PRIMARY KEY, vec BLOB)")
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                self._disable(e)
+        return self._conn
+
+    def _disable(self, error: Exception) -> None:
+        print(f"Embedding cache disabled: {error}")
+        self._disabled = True
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def _remember(self, key: bytes, blob: bytes) -> None:
+        self._memo[key] = blob
+        self._memo.move_to_end(key)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = self.key(model, text)
+        with self._lock:
+            blob = self._memo.get(key)
+            if blob is None:
+                conn = self._db()
+                if conn is None:
+                    return None
+                try:
+                    row = conn.execute("SELECT vec FROM embeddings_f16 WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error as e:
+                    self._disable(e)
+                    return None
+                if row is None:
+                    return None
+                blob = row[0]
+            self._remember(key, blob)
+        return _unpack_vector(blob)
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        key = self.key(model, text)
         try:
-            client = openai.OpenAI()
-            response = client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=text[:8000]  # Truncate to model limit
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"OpenAI embedding failed: {e}")
+            blob = _pack_vector(vector)
+        except (struct.error, OverflowError):
+            return  # outside float16 range; not worth caching
+        with self._lock:
+            self._remember(key, blob)
+            conn = self._db()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO embeddings_f16 (key, vec) VALUES (?, ?)",
+                        (key, blob)
+                    )
+            except sqlite3.Error as e:
+                self._disable(e)
+
+
+embedding_cache = EmbeddingCache()
 
-    # Try Ollama
+
+@functools.lru_cache(maxsize=1)
+def _openai_client():
+    return openai.OpenAI()
+
+
+@functools.lru_cache(maxsize=1)
+def _ollama_client():
+    # Shared pooled client so keep-alive connections survive across calls
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+    return httpx.Client(timeout=30, limits=limits)
+
+
+def _openai_embed(texts: List[str]) -> List[Optional[List[float]]]:
+    client = _openai_client()
+    response = client.embeddings.create(model=OPENAI_EMBEDDING_MODEL, input=texts)
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+def _ollama_embed(texts: List[str]) -> List[Optional[List[float]]]:
+    # Ollama's endpoint embeds one prompt per call; reuse one connection
+    vectors: List[Optional[List[float]]] = []
+    client = _ollama_client()
+    for text in texts:
+        resp = client.post(
+            f"{OLLAMA_HOST}/api/embeddings",
+            json={"model": OLLAMA_EMBEDDING_MODEL, "prompt": text}
+        )
+        if resp.status_code != 200:
+            vectors.append(None)
+            continue
+        embedding = resp.json().get("embedding", [])
+        # Pad or truncate to EMBEDDING_DIM
+        if len(embedding) < EMBEDDING_DIM:
+            embedding.extend([0.0] * (EMBEDDING_DIM - len(embedding)))
+        vectors.append(embedding[:EMBEDDING_DIM])
+    return vectors
+
+
+def _embedding_providers():
+    if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
+        yield "OpenAI", OPENAI_EMBEDDING_MODEL, _openai_embed
     if HTTPX_AVAILABLE:
+        yield "Ollama", OLLAMA_EMBEDDING_MODEL, _ollama_embed
+
+
+def get_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
+    """
+    Generate embeddings for several texts, consulting the cache first.
+
+    Providers are tried in the same order as get_embedding(); OpenAI takes
+    all cache misses in one request. Repeated texts are embedded once and
+    share the resulting vector.
+    """
+    requested = [text[:8000] for text in texts]  # Truncate to model limit
+    texts = list(dict.fromkeys(requested))
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+    for name, model, embed in _embedding_providers():
+        for i, text in enumerate(texts):
+            if vectors[i] is None:
+                vectors[i] = embedding_cache.get(model, text)
+        todo = [i for i, vector in enumerate(vectors) if vector is None]
+        if not todo:
+            break
         try:
-            with httpx.Client(timeout=30) as client:
-                resp = client.post(
-                    f"{OLLAMA_HOST}/api/embeddings",
-                    json={"model": "nomic-embed-text", "prompt": text[:8000]}
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    embedding = data.get("embedding", [])
-                    # Pad or truncate to EMBEDDING_DIM
-                    if len(embedding) < EMBEDDING_DIM:
-                        embedding.extend([0.0] * (EMBEDDING_DIM - len(embedding)))
-                    return embedding[:EMBEDDING_DIM]
+            fresh = embed([texts[i] for i in todo])
         except Exception as e:
-            print(f"Ollama embedding failed: {e}")
+            print(f"{name} embedding failed: {e}")
+            continue
+        for i, vector in zip(todo, fresh):
+            if vector:
+                vectors[i] = vector
+                embedding_cache.put(model, texts[i], vector)
+        if all(vector is not None for vector in vectors):
+            break
+
+    if len(texts) == len(requested):
+        return vectors
+    by_text = dict(zip(texts, vectors))
+    return [by_text[text] for text in requested]
+
+
+def get_embedding(text: str) -> Optional[List[float]]:
+    """
+    Generate embedding for text using available providers.
+
+    Priority:
+    1. OpenAI API (if OPENAI_API_KEY set)
+    2. Local Ollama (if running)
+    3. None (fall back to keyword search)
 
-    return None
+    Results are cached on disk by (model, text), see EmbeddingCache.
+    """
+    return get_embeddings([text])[0]
 
 
 def content_hash(content: str) -> str:
@@ -148,6 +346,8 @@ def content_hash(content: str) -> str:
 # Memory Bridge Class
 # ==============================================================================
 
+SYNC_BATCH_SIZE = 256  # workflows per embedding request / upsert during sync
+
 class MemoryBridge:
     """
     Bridge between Trapdoor mesh and Qdrant vector database.
@@ -191,7 +391,8 @@ class MemoryBridge:
                     vectors_config=VectorParams(
                         size=EMBEDDING_DIM,
                         distance=Distance.COSINE
-                    )
+                    ),
+                    quantization_config=QUANTIZATION_CONFIG
                 )
                 print(f"Created collection: {name}")
 
@@ -264,6 +465,50 @@ class MemoryBridge:
             print(f"Failed to store memory: {e}")
             return None
 
+    def store_batch(self, entries: List[Dict[str, Any]], wait: bool = True) -> List[str]:
+        """
+        Store several memory entries with one embedding request and one
+        upsert per collection.
+
+        Each entry takes the same keys as store(): content, and optionally
+        category, source, tags, metadata.
+
+        Returns the IDs of the entries that were written.
+        """
+        if not self._connected or not entries:
+            return []
+
+        vectors = get_embeddings([e["content"] for e in entries])
+        created_at = datetime.now().isoformat()
+
+        points_by_collection: Dict[str, List[Any]] = {}
+        for entry, vector in zip(entries, vectors):
+            category = entry.get("category", "knowledge")
+            collection = COLLECTIONS.get(category, COLLECTIONS["knowledge"])
+            points_by_collection.setdefault(collection, []).append(
+                PointStruct(
+                    id=content_hash(entry["content"]),
+                    vector=vector or [0.0] * EMBEDDING_DIM,
+                    payload={
+                        "content": entry["content"],
+                        "category": category,
+                        "source": entry.get("source", "unknown"),
+                        "tags": entry.get("tags") or [],
+                        "metadata": entry.get("metadata") or {},
+                        "created_at": created_at
+                    }
+                )
+            )
+
+        stored: List[str] = []
+        for collection, points in points_by_collection.items():
+            try:
+                self.client.upsert(collection_name=collection, points=points, wait=wait)
+                stored.extend(str(p.id) for p in points)
+            except Exception as e:
+                print(f"Failed to store {len(points)} memories in {collection}: {e}")
+        return stored
+
     def search(
         self,
         query: str,
@@ -294,6 +539,42 @@ class MemoryBridge:
             print("Warning: Could not generate query embedding")
             return []
 
+        return self._search_vector(query_vector, category, source, tags, limit)
+
+    def search_many(self, queries: List[Dict[str, Any]]) -> List[List[SearchResult]]:
+        """
+        Run several searches with one embedding request for all queries.
+
+        Each query takes the same keys as search(): query, and optionally
+        category, source, tags, limit. Results come back in input order.
+        """
+        if not self._connected or not queries:
+            return [[] for _ in queries]
+
+        vectors = get_embeddings([q["query"] for q in queries])
+        results: List[List[SearchResult]] = []
+        for q, vector in zip(queries, vectors):
+            if not vector:
+                print("Warning: Could not generate query embedding")
+                results.append([])
+                continue
+            results.append(self._search_vector(
+                vector,
+                q.get("category"),
+                q.get("source"),
+                q.get("tags"),
+                q.get("limit", 10)
+            ))
+        return results
+
+    def _search_vector(
+        self,
+        query_vector: List[float],
+        category: Optional[str],
+        source: Optional[str],
+        tags: Optional[List[str]],
+        limit: int
+    ) -> List[SearchResult]:
         # Build filter
         filter_conditions = []
         if source:
@@ -314,8 +595,7 @@ class MemoryBridge:
             else list(COLLECTIONS.values())
         )
 
-        results = []
-        for collection in collections_to_search:
+        def search_collection(collection: str) -> List[SearchResult]:
             try:
                 hits = self.client.search(
                     collection_name=collection,
@@ -323,21 +603,32 @@ class MemoryBridge:
                     query_filter=search_filter,
                     limit=limit
                 )
-
-                for hit in hits:
-                    payload = hit.payload
-                    entry = MemoryEntry(
-                        id=str(hit.id),
-                        content=payload.get("content", ""),
-                        category=payload.get("category", "unknown"),
-                        source=payload.get("source", "unknown"),
-                        tags=payload.get("tags", []),
-                        metadata=payload.get("metadata", {}),
-                        created_at=payload.get("created_at", "")
-                    )
-                    results.append(SearchResult(entry=entry, score=hit.score))
             except Exception as e:
                 print(f"Search failed in {collection}: {e}")
+                return []
+
+            found = []
+            for hit in hits:
+                payload = hit.payload
+                entry = MemoryEntry(
+                    id=str(hit.id),
+                    content=payload.get("content", ""),
+                    category=payload.get("category", "unknown"),
+                    source=payload.get("source", "unknown"),
+                    tags=payload.get("tags", []),
+                    metadata=payload.get("metadata", {}),
+                    created_at=payload.get("created_at", "")
+                )
+                found.append(SearchResult(entry=entry, score=hit.score))
+            return found
+
+        # Qdrant has no cross-collection batch search, so overlap the RPCs
+        if len(collections_to_search) > 1:
+            with ThreadPoolExecutor(max_workers=len(collections_to_search)) as pool:
+                per_collection = list(pool.map(search_collection, collections_to_search))
+        else:
+            per_collection = [search_collection(c) for c in collections_to_search]
+        results = [r for found in per_collection for r in found]
 
         # Sort by score and limit
         results.sort(key=lambda r: r.score, reverse=True)
@@ -349,42 +640,80 @@ class MemoryBridge:
 
         Returns number of entries imported.
         """
-        if not self._connected:
-            return 0
-
+        count = 0
         try:
-            from pathlib import Path
-            events_file = Path(events_path)
-            if not events_file.exists():
-                print(f"Events file not found: {events_path}")
-                return 0
-
-            count = 0
-            with open(events_file) as f:
-                for line in f:
-                    try:
-                        event = json.loads(line)
-                        if event.get("kind") == "workflow":
-                            data = event.get("data", {})
-                            content = f"Workflow: {data.get('intent', 'Unknown')}\n"
-                            content += f"Steps: {json.dumps(data.get('steps', []))}\n"
-                            content += f"Result: {data.get('result', 'Unknown')}"
-
-                            self.store(
-                                content=content,
-                                category="workflow",
-                                source="local",
-                                tags=["imported", "workflow"],
-                                metadata=data
-                            )
-                            count += 1
-                    except json.JSONDecodeError:
-                        continue
-
-            return count
+            for count in self.iter_sync_from_events(events_path):
+                pass
         except Exception as e:
             print(f"Sync failed: {e}")
             return 0
+        return count
+
+    def iter_sync_from_events(self, events_path: str = "memory/events.jsonl") -> Iterator[int]:
+        """
+        Import workflows like sync_from_events(), yielding the running count
+        after each chunk is handed to Qdrant. Errors propagate to the caller.
+        """
+        if not self._connected:
+            return
+
+        events_file = Path(events_path)
+        if not events_file.exists():
+            print(f"Events file not found: {events_path}")
+            return
+
+        # memory/store.py keeps workflow payloads in their own log next to
+        # events.jsonl; read that when present instead of filtering every event
+        workflows_file = events_file.with_name("workflows.jsonl")
+        use_sublog = workflows_file.exists()
+
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        # The last full chunk is held back until EOF, so the final upsert is
+        # never empty and always waits
+        held: List[Dict[str, Any]] = []
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        with open(workflows_file if use_sublog else events_file, "rb") as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if use_sublog:
+                    data = record
+                elif record.get("kind") == "workflow":
+                    data = record.get("data", {})
+                else:
+                    continue
+                content = f"Workflow: {data.get('intent', 'Unknown')}\n"
+                content += f"Steps: {json.dumps(data.get('steps', []))}\n"
+                content += f"Result: {data.get('result', 'Unknown')}"
+
+                batch.append({
+                    "content": content,
+                    "category": "workflow",
+                    "source": "local",
+                    "tags": ["imported", "workflow"],
+                    "metadata": data
+                })
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    if held:
+                        # Don't wait for Qdrant to apply intermediate chunks
+                        self.store_batch(held, wait=False)
+                        count += len(held)
+                        yield count
+                    held, batch = batch, []
+
+        if held and batch:
+            self.store_batch(held, wait=False)
+            count += len(held)
+            yield count
+            held = []
+        # The final chunk waits, so the sync is durable once we return
+        final = batch or held
+        self.store_batch(final, wait=True)
+        count += len(final)
+        yield count
 
     def health(self) -> Dict[str, Any]:
         """Return health status and stats."""
@@ -427,20 +756,30 @@ class MemoryBridge:
 # FastAPI Endpoints (for integration with trapdoor server)
 # ==============================================================================
 
-def create_memory_router():
-    """
-    Create FastAPI router for memory endpoints.
+# Upper bound on items per /batch_store or /batch_search request
+BATCH_MAX_ITEMS = 100
 
-    Add to your FastAPI app:
-        from memory_bridge import create_memory_router
-        app.include_router(create_memory_router(), prefix="/v1/memory")
-    """
-    from fastapi import APIRouter, HTTPException
-    from pydantic import BaseModel
+# Seconds a /health probe result is reused before Qdrant is asked again
+HEALTH_TTL = 2.0
+
+# /search result memo: entry count and seconds before an entry is recomputed
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 300.0
 
-    router = APIRouter()
-    bridge = MemoryBridge()
 
+def _ndjson(record: Dict[str, Any]) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def get_bridge() -> MemoryBridge:
+    """Return the process-wide MemoryBridge (one Qdrant client for all callers)."""
+    return MemoryBridge()
+
+
+if FASTAPI_AVAILABLE:
     class StoreRequest(BaseModel):
         content: str
         category: str = "knowledge"
@@ -455,13 +794,46 @@ def create_memory_router():
         tags: Optional[List[str]] = None
         limit: int = 10
 
-    @router.get("/health")
-    def memory_health():
-        return bridge.health()
+    class BatchStoreRequest(BaseModel):
+        items: List[StoreRequest] = Field(..., max_length=BATCH_MAX_ITEMS)
+
+    class BatchSearchRequest(BaseModel):
+        queries: List[SearchRequest] = Field(..., max_length=BATCH_MAX_ITEMS)
+
+
+def create_memory_router():
+    """
+    Create FastAPI router for memory endpoints.
+
+    Add to your FastAPI app:
+        from memory_bridge import create_memory_router
+        app.include_router(create_memory_router(), prefix="/v1/memory")
+    """
+    if not FASTAPI_AVAILABLE:
+        raise ImportError("create_memory_router requires fastapi and pydantic")
+
+    router = APIRouter()
+    bridge = get_bridge()
+
+    health_cache: Dict[str, Any] = {"ts": float("-inf"), "value": None}
+    health_lock = asyncio.Lock()
 
+    @router.get("/health")
+    async def memory_health():
+        if time.monotonic() - health_cache["ts"] < HEALTH_TTL:
+            return health_cache["value"]
+        # Only one request re-probes on expiry; the rest wait and reuse it
+        async with health_lock:
+            if time.monotonic() - health_cache["ts"] >= HEALTH_TTL:
+                health_cache["value"] = await asyncio.to_thread(bridge.health)
+                health_cache["ts"] = time.monotonic()
+        return health_cache["value"]
+
+    # Bridge calls block on embedding and Qdrant I/O; run them off the event loop
     @router.post("/store")
-    def memory_store(req: StoreRequest):
-        entry_id = bridge.store(
+    async def memory_store(req: StoreRequest):
+        entry_id = await asyncio.to_thread(
+            bridge.store,
             content=req.content,
             category=req.category,
             source=req.source,
@@ -469,28 +841,101 @@ def create_memory_router():
             metadata=req.metadata
         )
         if entry_id:
+            search_cache.clear()
             return {"status": "stored", "id": entry_id}
         raise HTTPException(500, "Failed to store memory")
 
+    def respond(payload: Dict[str, Any]):
+        # orjson encodes the SearchResult dataclasses directly; otherwise
+        # FastAPI's jsonable_encoder walks them.
+        return ORJSONResponse(payload) if ORJSON_AVAILABLE else payload
+
+    # (query, category, source, sorted tags, limit) -> (stored_at, results).
+    # Only touched from the event loop, so no lock; writes through this
+    # router clear it.
+    search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
     @router.post("/search")
-    def memory_search(req: SearchRequest):
-        results = bridge.search(
-            query=req.query,
-            category=req.category,
-            source=req.source,
-            tags=req.tags,
-            limit=req.limit
-        )
-        return {
+    async def memory_search(req: SearchRequest):
+        key = (req.query, req.category, req.source, tuple(sorted(req.tags or ())), req.limit)
+        now = time.monotonic()
+        hit = search_cache.get(key)
+        if hit is not None and now - hit[0] < SEARCH_CACHE_TTL:
+            search_cache.move_to_end(key)
+            results = hit[1]
+        else:
+            found = await asyncio.to_thread(
+                bridge.search,
+                query=req.query,
+                category=req.category,
+                source=req.source,
+                tags=req.tags,
+                limit=req.limit
+            )
+            results = tuple(found)
+            # Empty results usually mean Qdrant or the embedder is down
+            if results:
+                search_cache[key] = (now, results)
+                search_cache.move_to_end(key)
+                while len(search_cache) > SEARCH_CACHE_SIZE:
+                    search_cache.popitem(last=False)
+            else:
+                search_cache.pop(key, None)
+        return respond({
             "query": req.query,
-            "results": [r.to_dict() for r in results],
+            "results": results,
             "count": len(results)
-        }
+        })
+
+    @router.post("/batch_store")
+    async def memory_batch_store(req: BatchStoreRequest):
+        ids = await asyncio.to_thread(
+            bridge.store_batch, [item.model_dump() for item in req.items]
+        )
+        if req.items and not ids:
+            raise HTTPException(500, "Failed to store memories")
+        search_cache.clear()
+        return {"status": "stored", "ids": ids, "count": len(ids)}
+
+    @router.post("/batch_search")
+    async def memory_batch_search(req: BatchSearchRequest):
+        per_query = await asyncio.to_thread(
+            bridge.search_many, [q.model_dump() for q in req.queries]
+        )
+        return respond({
+            "results": [
+                {
+                    "query": q.query,
+                    "results": results,
+                    "count": len(results)
+                }
+                for q, results in zip(req.queries, per_query)
+            ],
+            "count": len(per_query)
+        })
 
     @router.post("/sync")
-    def memory_sync():
-        count = bridge.sync_from_events()
-        return {"status": "synced", "entries_imported": count}
+    async def memory_sync():
+        """Stream NDJSON progress lines, ending with a status line."""
+        async def progress():
+            steps = bridge.iter_sync_from_events()
+            count = 0
+            try:
+                while True:
+                    step = await asyncio.to_thread(next, steps, None)
+                    if step is None:
+                        break
+                    count = step
+                    yield _ndjson({"imported": count})
+            except Exception as e:
+                print(f"Sync failed: {e}")
+                yield _ndjson({"status": "failed", "error": str(e)})
+                return
+            finally:
+                search_cache.clear()
+            yield _ndjson({"status": "synced", "entries_imported": count})
+
+        return StreamingResponse(progress(), media_type="application/x-ndjson")
 
     return router
 
@@ -526,7 +971,7 @@ def main():
     subparsers.add_parser("sync", help="Sync from events.jsonl")
 
     args = parser.parse_args()
-    bridge = MemoryBridge()
+    bridge = get_bridge()
 
     if args.command == "health":
         print(json.dumps(bridge.health(), indent=2))
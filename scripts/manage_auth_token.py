@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Python port of manage_auth_token.sh for in-process use by the control panel.
+
+Same commands, environment overrides and keychain layout as the shell script;
+main() returns (returncode, stdout, stderr) instead of printing.
+"""
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG_PATH = BASE_DIR / "config" / "trapdoor.json"
+
+USAGE = """Usage: scripts/manage_auth_token.sh <command>
+
+Commands:
+  ensure-file   Ensure keychain entry exists and sync it to the AUTH_TOKEN_FILE.
+  rotate        Generate and store a new token, updating the keychain and file.
+  print         Print the current token to stdout.
+  delete        Remove the keychain entry and delete the token file.
+"""
+
+Result = Tuple[int, str, str]
+
+
+def _settings(env: Dict[str, str]) -> Tuple[str, str, Path]:
+    config_path = Path(env.get("CONFIG_PATH") or DEFAULT_CONFIG_PATH)
+    auth_cfg: Dict[str, str] = {}
+    if not all(env.get(k) for k in ("AUTH_TOKEN_KEYCHAIN_SERVICE", "AUTH_TOKEN_KEYCHAIN_ACCOUNT", "AUTH_TOKEN_FILE")):
+        with config_path.open("r", encoding="utf-8") as fh:
+            auth_cfg = json.load(fh)["auth"]
+    service = env.get("AUTH_TOKEN_KEYCHAIN_SERVICE") or auth_cfg["keychain_service"]
+    account = env.get("AUTH_TOKEN_KEYCHAIN_ACCOUNT") or auth_cfg["keychain_account"]
+    token_file = Path(env.get("AUTH_TOKEN_FILE") or auth_cfg["token_file"])
+    return service, account, token_file
+
+
+def _security(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["security", *args], capture_output=True, text=True)
+
+
+def _write_file(token_file: Path, token: str) -> None:
+    token_file.parent.mkdir(parents=True, exist_ok=True)
+    token_file.write_text(f"{token}\n", encoding="utf-8")
+    token_file.chmod(0o600)
+
+
+def _store(service: str, account: str, token: str) -> Optional[str]:
+    proc = _security("add-generic-password", "-U", "-s", service, "-a", account, "-w", token)
+    return None if proc.returncode == 0 else proc.stderr
+
+
+def ensure_entry(service: str, account: str, token_file: Path) -> Result:
+    found = _security("find-generic-password", "-s", service, "-a", account, "-w")
+    if found.returncode == 0:
+        _write_file(token_file, found.stdout.strip())
+        return 0, "", ""
+    token = secrets.token_hex(16)
+    error = _store(service, account, token)
+    if error is not None:
+        return 1, "", error
+    _write_file(token_file, token)
+    return 0, f"Created new keychain item '{service}' (account '{account}').\n", ""
+
+
+def rotate_entry(service: str, account: str, token_file: Path) -> Result:
+    token = secrets.token_hex(16)
+    error = _store(service, account, token)
+    if error is not None:
+        return 1, "", error
+    _write_file(token_file, token)
+    return 0, f"Rotated keychain item '{service}'.\n", ""
+
+
+def print_entry(service: str, account: str, token_file: Path) -> Result:
+    found = _security("find-generic-password", "-s", service, "-a", account, "-w")
+    return found.returncode, found.stdout, found.stderr
+
+
+def delete_entry(service: str, account: str, token_file: Path) -> Result:
+    _security("delete-generic-password", "-s", service, "-a", account)
+    token_file.unlink(missing_ok=True)
+    return 0, f"Deleted keychain item '{service}' and removed {token_file} (if present).\n", ""
+
+
+COMMANDS = {
+    "ensure-file": ensure_entry,
+    "rotate": rotate_entry,
+    "print": print_entry,
+    "delete": delete_entry,
+}
+
+
+def main(args: list[str], env: Optional[Dict[str, str]] = None) -> Result:
+    command = COMMANDS.get(args[0] if args else "")
+    if command is None:
+        return 1, USAGE, ""
+    if shutil.which("security") is None:
+        return 1, "", "The macOS 'security' CLI is required for keychain operations.\n"
+    try:
+        settings = _settings(os.environ if env is None else env)
+    except (OSError, KeyError, json.JSONDecodeError) as err:
+        return 1, "", f"Could not read auth settings: {err}\n"
+    return command(*settings)
+
+
+if __name__ == "__main__":
+    rc, out, err = main(sys.argv[1:])
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    sys.exit(rc)
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import html
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from string import Template
 from typing import Dict, Any
@@ -20,9 +23,36 @@ def _load_json(path: Path) -> Dict[str, Any]:
         return json.load(fh)
 
 
+@functools.lru_cache(maxsize=16)
+def _load_template(path_str: str, mtime_ns: int) -> Template:
+    # mtime_ns is only part of the cache key, so edited templates are re-read
+    return Template(Path(path_str).read_text(encoding="utf-8"))
+
+
 def _render_template(template_path: Path, mapping: Dict[str, str]) -> str:
-    template = Template(template_path.read_text(encoding="utf-8"))
-    return template.safe_substitute(mapping)
+    st = template_path.stat()
+    return _load_template(str(template_path), st.st_mtime_ns).safe_substitute(mapping)
+
+
+def _render_one(template_path: Path, mapping: Dict[str, str], target_path: Path) -> None:
+    new = _render_template(template_path, mapping).encode("utf-8")
+    try:
+        existing = target_path.read_bytes()
+        mode = target_path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        existing, mode = None, None
+    # Leave unchanged files alone so launchd/cloudflared don't see an mtime bump.
+    if existing == new:
+        return
+    tmp_path = target_path.with_name(f".{target_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(new)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def render(config_path: Path) -> None:
@@ -35,12 +65,19 @@ def render(config_path: Path) -> None:
 
     log_dir = Path(launch_cfg["log_dir"])
 
+    # Values shared by more than one template are converted once.
+    common = {
+        "PATH_ENV": launch_cfg["path_env"],
+        "LOG_DIR": str(log_dir),
+        "PORT": str(app_cfg["port"]),
+    }
+
     localproxy_mapping = {
+        **common,
         "LOCALPROXY_LABEL": launch_cfg["localproxy_label"],
         "PYTHON_PATH": launch_cfg["python_path"],
         "SERVER_PATH": launch_cfg["server_path"],
         "WORKING_DIR": launch_cfg["working_directory"],
-        "PATH_ENV": launch_cfg["path_env"],
         "BACKEND": app_cfg["backend"],
         "MODEL": app_cfg["model"],
         "AUTH_TOKEN_FILE": auth_cfg["token_file"],
@@ -48,42 +85,45 @@ def render(config_path: Path) -> None:
         "ALLOW_ABSOLUTE": "1" if app_cfg.get("allow_absolute", False) else "0",
         "ALLOW_SUDO": "1" if app_cfg.get("allow_sudo", False) else "0",
         "DEFAULT_SYSTEM_PROMPT": html.escape(app_cfg.get("default_system_prompt", "")),
-        "PORT": str(app_cfg["port"]),
-        "LOG_DIR": str(log_dir),
     }
 
     cloudflare_mapping = {
+        **common,
         "CLOUDFLARE_LABEL": launch_cfg["cloudflared_label"],
         "CLOUDFLARE_TOKEN": cf_cfg["token"],
         "CLOUDFLARED_BIN": launch_cfg["cloudflared_bin"],
-        "PATH_ENV": launch_cfg["path_env"],
-        "LOG_DIR": str(log_dir),
     }
 
     cloudflared_cfg_mapping = {
+        **common,
         "TUNNEL_ID": cf_cfg["tunnel_id"],
         "CONFIG_DIR": cf_cfg["config_dir"],
         "HOSTNAME": cf_cfg["hostname"],
-        "PORT": str(app_cfg["port"]),
-    }
-
-    outputs = {
-        "com.trapdoor.localproxy.plist.tmpl": BASE_DIR / "plists" / "com.trapdoor.localproxy.plist",
-        "com.trapdoor.cloudflared.plist.tmpl": BASE_DIR / "plists" / "com.trapdoor.cloudflared.plist",
-        "cloudflared.config.yml.tmpl": BASE_DIR / "config" / "cloudflared.config.yml",
     }
 
-    for template_name, target_path in outputs.items():
-        template_path = TEMPLATE_DIR / template_name
-        if template_name == "com.trapdoor.localproxy.plist.tmpl":
-            rendered = _render_template(template_path, localproxy_mapping)
-        elif template_name == "com.trapdoor.cloudflared.plist.tmpl":
-            rendered = _render_template(template_path, cloudflare_mapping)
-        else:
-            rendered = _render_template(template_path, cloudflared_cfg_mapping)
-
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        target_path.write_text(rendered, encoding="utf-8")
+    tasks = [
+        (
+            TEMPLATE_DIR / "com.trapdoor.localproxy.plist.tmpl",
+            localproxy_mapping,
+            BASE_DIR / "plists" / "com.trapdoor.localproxy.plist",
+        ),
+        (
+            TEMPLATE_DIR / "com.trapdoor.cloudflared.plist.tmpl",
+            cloudflare_mapping,
+            BASE_DIR / "plists" / "com.trapdoor.cloudflared.plist",
+        ),
+        (
+            TEMPLATE_DIR / "cloudflared.config.yml.tmpl",
+            cloudflared_cfg_mapping,
+            BASE_DIR / "config" / "cloudflared.config.yml",
+        ),
+    ]
+
+    # Create each output directory once up front, then overlap the file I/O.
+    for parent in {target_path.parent for _, _, target_path in tasks}:
+        parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        list(pool.map(lambda task: _render_one(*task), tasks))
 
 
 def main() -> None:
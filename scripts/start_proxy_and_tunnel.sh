@@ -106,6 +106,10 @@ PYTHON_BIN="${PYTHON_BIN:-$PYTHON_PATH_DEFAULT}"
 
 mkdir -p .proxy_runtime
 
+# Job control puts each background daemon in its own process group (pgid ==
+# the pid we record), so stop can signal the daemon and anything it forks.
+set -m
+
 # Ensure requested Ollama model is available before booting the proxy
 ensure_ollama_model() {
   local log_dir=".proxy_runtime"
@@ -116,7 +120,7 @@ ensure_ollama_model() {
   fi
   if ! pgrep -x ollama >/dev/null 2>&1; then
     echo "==> Starting Ollama daemon..."
-    nohup ollama serve > "$log_dir/ollama_nohup.log" 2>&1 & echo $! > "$log_dir/ollama.pid"
+    nohup ollama serve > "$log_dir/ollama_nohup.log" 2>&1 < /dev/null & echo $! > "$log_dir/ollama.pid"
     for i in {1..60}; do
       if command -v curl >/dev/null 2>&1 && curl -sf http://127.0.0.1:11434/api/tags >/dev/null 2>&1; then
         break
@@ -167,7 +171,7 @@ if [[ ! -f "$SERVER_PATH" ]]; then
   echo "ERROR: Server script not found at $SERVER_PATH" >&2
   exit 1
 fi
-nohup "$PYTHON_BIN" "$SERVER_PATH" > .proxy_runtime/server_nohup.log 2>&1 & echo $! > server.pid
+nohup "$PYTHON_BIN" "$SERVER_PATH" > .proxy_runtime/server_nohup.log 2>&1 < /dev/null & echo $! > server.pid
 
 for i in {1..60}; do
   if curl -sf "http://127.0.0.1:$PORT/health" >/dev/null; then
@@ -9,6 +9,7 @@ Provides:
 - Approval workflows
 """
 
+import atexit
 import json
 import hashlib
 import os
@@ -86,6 +87,22 @@ class TokenInfo:
     
     # Metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
+
+    # Memoized isoformat() strings: field name -> (datetime, iso string)
+    _iso_cache: Dict[str, tuple] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _iso(self, name: str) -> Optional[str]:
+        """isoformat() of a datetime field, recomputed only when the field changes"""
+        value = getattr(self, name)
+        if value is None:
+            return None
+        cached = self._iso_cache.get(name)
+        if cached is None or cached[0] is not value:
+            cached = (value, value.isoformat())
+            self._iso_cache[name] = cached
+        return cached[1]
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary (for storage)"""
@@ -94,9 +111,9 @@ class TokenInfo:
             "name": self.name,
             "token": self.token,
             "scopes": list(self.scopes),
-            "created": self.created.isoformat(),
-            "expires": self.expires.isoformat() if self.expires else None,
-            "last_used": self.last_used.isoformat() if self.last_used else None,
+            "created": self._iso("created"),
+            "expires": self._iso("expires"),
+            "last_used": self._iso("last_used"),
             "enabled": self.enabled,
             "path_allowlist": self.path_allowlist,
             "path_denylist": self.path_denylist,
@@ -151,12 +168,20 @@ class TokenManager:
         self.tokens: Dict[str, TokenInfo] = {}
         self.token_lookup: Dict[str, str] = {}  # token -> token_id
         self.lock = threading.RLock()
+        # token_id -> public entry; last_used is patched in place by validate_token
+        self._tokens_snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+
+        # last_used bumps are persisted at most once per save interval
+        self.last_used_save_interval = 60.0
+        self._dirty = False
+        self._last_save = time.monotonic()
         
         # Global rules
         self.global_denylist: List[str] = []
         self.require_approval_operations: Set[str] = set()
         
         self._load_tokens()
+        atexit.register(self.flush)
     
     def _load_tokens(self) -> None:
         """Load tokens from config file with automatic recovery"""
@@ -227,6 +252,9 @@ class TokenManager:
     def save_tokens(self) -> None:
         """Save tokens to config file with atomic write and backup"""
         with self.lock:
+            # Every mutation is persisted through here
+            self._tokens_snapshot = None
+
             # Build config
             config = {
                 "tokens": [t.to_dict() for t in self.tokens.values()],
@@ -259,6 +287,8 @@ class TokenManager:
 
                 # Atomic commit (POSIX rename is atomic)
                 temp_path.replace(self.config_path)
+                self._dirty = False
+                self._last_save = time.monotonic()
 
             except Exception as e:
                 # Cleanup temp file on failure
@@ -266,6 +296,31 @@ class TokenManager:
                     temp_path.unlink()
                 raise RuntimeError(f"Token save failed: {e}") from e
     
+    def flush(self) -> None:
+        """Persist pending last_used updates (also runs at interpreter exit)"""
+        with self.lock:
+            if self._dirty:
+                self.save_tokens()
+
+    def list_tokens(self) -> List[Dict[str, Any]]:
+        """Public view of all tokens (no token values), cached until next save"""
+        with self.lock:
+            if self._tokens_snapshot is None:
+                self._tokens_snapshot = {
+                    tinfo.token_id: {
+                        "token_id": tinfo.token_id,
+                        "name": tinfo.name,
+                        "scopes": list(tinfo.scopes),
+                        "enabled": tinfo.enabled,
+                        "created": tinfo._iso("created"),
+                        "expires": tinfo._iso("expires"),
+                        "last_used": tinfo._iso("last_used"),
+                        "metadata": tinfo.metadata
+                    }
+                    for tinfo in self.tokens.values()
+                }
+            return list(self._tokens_snapshot.values())
+
     def validate_token(self, token: str) -> TokenInfo:
         """Validate token and return TokenInfo"""
         if not token:
@@ -282,13 +337,21 @@ class TokenManager:
             raise HTTPException(status_code=403, detail="Token is disabled")
         
         # Check if token is expired
-        if token_info.expires and datetime.now() > token_info.expires:
+        now = datetime.now()
+        if token_info.expires and now > token_info.expires:
             raise TokenExpiredError(f"Token expired on {token_info.expires.isoformat()}")
         
-        # Update last used timestamp
+        # Update last used timestamp in memory; rewriting tokens.json (all N
+        # tokens) on every request is debounced to once per save interval
         with self.lock:
-            token_info.last_used = datetime.now()
-            self.save_tokens()
+            token_info.last_used = now
+            if self._tokens_snapshot is not None:
+                entry = self._tokens_snapshot.get(token_id)
+                if entry is not None:
+                    entry["last_used"] = token_info._iso("last_used")
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.last_used_save_interval:
+                self.save_tokens()
         
         return token_info
     
@@ -591,10 +654,10 @@ class ApprovalQueue:
         
         while time.time() - start < timeout:
             with self.lock:
-                if request_id not in self.pending:
+                op = self.pending.get(request_id)
+                if op is None:
                     return False
                 
-                op = self.pending[request_id]
                 if op.status == "approved":
                     del self.pending[request_id]
                     return True
@@ -606,24 +669,25 @@ class ApprovalQueue:
         
         # Timeout - remove from queue
         with self.lock:
-            if request_id in self.pending:
-                del self.pending[request_id]
+            self.pending.pop(request_id, None)
         
         return False
     
     def approve(self, request_id: str) -> bool:
         """Approve a pending operation"""
         with self.lock:
-            if request_id in self.pending:
-                self.pending[request_id].status = "approved"
+            op = self.pending.get(request_id)
+            if op is not None:
+                op.status = "approved"
                 return True
         return False
     
     def deny(self, request_id: str) -> bool:
         """Deny a pending operation"""
         with self.lock:
-            if request_id in self.pending:
-                self.pending[request_id].status = "denied"
+            op = self.pending.get(request_id)
+            if op is not None:
+                op.status = "denied"
                 return True
         return False
     
@@ -46,21 +46,26 @@ _approval_queue: Optional[ApprovalQueue] = None
 
 def setup_security(
     config_path: Optional[Path] = None,
-    auto_migrate: bool = True
+    auto_migrate: bool = True,
+    base_dir: Optional[Path] = None
 ) -> Tuple[TokenManager, RateLimiter, ApprovalQueue]:
     """
     Initialize security system
     
     Args:
-        config_path: Path to tokens.json (default: config/tokens.json)
+        config_path: Path to tokens.json (default: config/tokens.json under base_dir)
         auto_migrate: Automatically migrate from AUTH_TOKEN if tokens.json doesn't exist
+        base_dir: Directory relative config paths are resolved against
+            (default: current directory), so callers never need to chdir
     
     Returns:
         (TokenManager, RateLimiter, ApprovalQueue)
     """
     global _token_manager, _rate_limiter, _approval_queue
     
-    config_path = config_path or Path("config/tokens.json")
+    config_path = Path(config_path or "config/tokens.json")
+    if base_dir is not None and not config_path.is_absolute():
+        config_path = Path(base_dir) / config_path
     
     # Auto-migrate if needed
     if auto_migrate and not config_path.exists():
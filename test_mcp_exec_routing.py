@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test how mcp_server.execute routes commands: plain argv commands are exec'd
+directly, while shell syntax and shell builtins go through /bin/sh.
+
+Run: python test_mcp_exec_routing.py
+"""
+
+import shlex
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import mcp_server
+
+
+def routed_to_shell(command: str) -> bool:
+    return mcp_server._needs_shell(command, shlex.split(command))
+
+
+class ExecRoutingTest(unittest.TestCase):
+    def test_plain_commands_are_execed(self):
+        for command in ("ls -la", "git status", "python3 --version", "grep -rn TODO src"):
+            self.assertFalse(routed_to_shell(command), command)
+
+    def test_shell_syntax_uses_shell(self):
+        for command in ("ls | wc -l", "echo hi > out.txt", "echo $HOME", "ls *.py",
+                        "true && false", "FOO=1 env"):
+            self.assertTrue(routed_to_shell(command), command)
+
+    def test_builtins_use_shell(self):
+        for command in ("command -v git", "type python", "cd /tmp", "umask",
+                        "ulimit -a", "hash", ". ./env.sh", "! false", "time ls"):
+            self.assertTrue(routed_to_shell(command), command)
+
+    def test_execute_passes_routing_to_subprocess(self):
+        completed = mock.Mock(stdout="", stderr="", returncode=0)
+        with mock.patch.object(mcp_server, "_check_perm"), \
+                mock.patch.object(mcp_server, "_log_memory"), \
+                mock.patch.object(mcp_server.subprocess, "run", return_value=completed) as run:
+            mcp_server.execute("git status")
+            self.assertEqual(run.call_args.args[0], ["git", "status"])
+            self.assertFalse(run.call_args.kwargs["shell"])
+
+            mcp_server.execute("command -v git")
+            self.assertEqual(run.call_args.args[0], "command -v git")
+            self.assertTrue(run.call_args.kwargs["shell"])
+
+            # shlex can't tokenize these, but /bin/sh can
+            for command in ("cat <<EOF\nit's ok\nEOF", "echo hi # it's a comment"):
+                mcp_server.execute(command)
+                self.assertEqual(run.call_args.args[0], command)
+                self.assertTrue(run.call_args.kwargs["shell"])
+
+    def test_builtin_runs_for_real(self):
+        with mock.patch.object(mcp_server, "_check_perm"), \
+                mock.patch.object(mcp_server, "_log_memory"):
+            output = mcp_server.execute("command -v sh")
+        self.assertIn("Return Code: 0", output)
+
+    def test_untokenizable_commands_run_for_real(self):
+        with mock.patch.object(mcp_server, "_check_perm"), \
+                mock.patch.object(mcp_server, "_log_memory"):
+            heredoc = mcp_server.execute("cat <<EOF\nit's ok\nEOF")
+            comment = mcp_server.execute("echo hi # it's a comment")
+            negated = mcp_server.execute("! false")
+        self.assertIn("it's ok", heredoc)
+        self.assertIn("Return Code: 0", heredoc)
+        self.assertIn("hi", comment)
+        self.assertIn("Return Code: 0", comment)
+        self.assertIn("Return Code: 0", negated)
+
+    def test_untokenizable_commands_still_check_sudo(self):
+        with mock.patch.object(mcp_server, "_check_perm"), \
+                mock.patch.object(mcp_server, "_log_memory"), \
+                mock.patch.object(mcp_server, "ALLOW_SUDO", False), \
+                mock.patch.object(mcp_server.subprocess, "run") as run:
+            output = mcp_server.execute("sudo cat <<EOF\nit's\nEOF")
+        self.assertIn("sudo not allowed", output)
+        run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,16 +14,25 @@ import os
 import secrets
 import socket
 import subprocess
+import sys
 import shutil
 from pathlib import Path
 from typing import Optional, List
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Header, Query
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 
+# orjson is optional; fall back to stdlib json responses
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ==============================================================================
 # Access Levels
 # ==============================================================================
@@ -62,6 +71,15 @@ ACCESS = LEVELS["limited"]
 PORT = 8080
 TOKEN_FILE = Path.home() / ".trapdoor" / "token"
 
+BANNER = """
+╔═══════════════════════════════════════════════════════════════════╗
+║                       TRAPDOOR 1.0                                ║
+║          Give cloud AIs safe access to your local machine         ║
+╚═══════════════════════════════════════════════════════════════════╝
+
+"""
+BANNER_RULE = "─" * 67
+
 # ==============================================================================
 # Token Management
 # ==============================================================================
@@ -106,7 +124,8 @@ def find_open_port(start_port: int = 8080, max_attempts: int = 100) -> int:
 app = FastAPI(
     title="Trapdoor 1.0",
     description="Give cloud AIs safe access to your local machine",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 app.add_middleware(
@@ -159,22 +178,27 @@ class ChatRequest(BaseModel):
 # Health Endpoint
 # ==============================================================================
 
+# Everything in /health but the timestamp depends only on ACCESS
+_health_base: dict = {}
+
 @app.get("/health")
 def health():
     """Health check - shows current access level"""
-    level_name = next((k for k, v in LEVELS.items() if v == ACCESS), "unknown")
-    return {
-        "status": "ok",
-        "version": "1.0.0",
-        "access_level": level_name,
-        "permissions": {
-            "read": ACCESS["fs_read"],
-            "write": ACCESS["fs_write"],
-            "delete": ACCESS["fs_delete"],
-            "exec": ACCESS["exec"],
-        },
-        "timestamp": datetime.now().isoformat()
-    }
+    base = _health_base.get(id(ACCESS))
+    if base is None:
+        level_name = next((k for k, v in LEVELS.items() if v == ACCESS), "unknown")
+        base = _health_base[id(ACCESS)] = {
+            "status": "ok",
+            "version": "1.0.0",
+            "access_level": level_name,
+            "permissions": {
+                "read": ACCESS["fs_read"],
+                "write": ACCESS["fs_write"],
+                "delete": ACCESS["fs_delete"],
+                "exec": ACCESS["exec"],
+            },
+        }
+    return {**base, "timestamp": datetime.now().isoformat()}
 
 # ==============================================================================
 # Filesystem Endpoints
@@ -499,14 +523,8 @@ Examples:
         PORT = find_open_port(requested_port + 1, max_attempts=100)
         print(f"⚠️  Port {requested_port} in use, using {PORT} instead\n")
 
-    # Print banner
-    print(f"""
-╔═══════════════════════════════════════════════════════════════════╗
-║                       TRAPDOOR 1.0                                ║
-║          Give cloud AIs safe access to your local machine         ║
-╚═══════════════════════════════════════════════════════════════════╝
-
-{level_icon} Access Level: {level_name.upper()}
+    # Print banner (one write; the fixed header is pre-rendered)
+    sys.stdout.write(BANNER + f"""{level_icon} Access Level: {level_name.upper()}
    {ACCESS['description']}{level_warning}
 
    Permissions:
@@ -523,8 +541,10 @@ To expose publicly:
     ngrok http {PORT}
 
 Then upload connector.py to ChatGPT/Claude with your URL + token
-{"─" * 67}
+{BANNER_RULE}
+
 """)
+    sys.stdout.flush()
 
     uvicorn.run(app, host=args.host, port=PORT)
 